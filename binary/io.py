@@ -1,4 +1,6 @@
 import struct
+from array import array
+from collections.abc import Iterable
 from typing import BinaryIO
 
 
@@ -20,6 +22,12 @@ class Reader:
         """Read an unsigned 32-bit integer."""
         return struct.unpack("I", self.read_bytes(4))[0]
 
+    def read_uint32_array(self, n: int) -> array[int]:
+        """Read n unsigned 32-bit integers with a single read."""
+        values = array("I")
+        values.frombytes(self.read_bytes(4 * n))
+        return values
+
     def read_uint64(self) -> int:
         """Read an unsigned 64-bit integer."""
         return struct.unpack("Q", self.read_bytes(8))[0]
@@ -53,6 +61,10 @@ class Writer:
         """Write an unsigned 32-bit integer."""
         self.file.write(struct.pack("I", value))
 
+    def write_uint32_array(self, values: Iterable[int]) -> None:
+        """Write a run of unsigned 32-bit integers in one buffer."""
+        self.file.write(array("I", values).tobytes())
+
     def write_uint64(self, value: int) -> None:
         """Write an unsigned 64-bit integer."""
         self.file.write(struct.pack("Q", value))
@@ -33,11 +33,10 @@ def read_instruction(file: Reader) -> Instruction:
 
 
 def read_local_var(file: Reader) -> LocalVar:
-    loc_var = LocalVar()
-    loc_var.name = file.read_string()
-    loc_var.start_pc = file.read_uint32()
-    loc_var.end_pc = file.read_uint32()
-    return loc_var
+    name = file.read_string()
+    start_pc = file.read_uint32()
+    end_pc = file.read_uint32()
+    return LocalVar(name, start_pc, end_pc)
 
 
 def read_debug(file: Reader) -> Debug:
@@ -84,10 +83,13 @@ def read_proto(file: Reader, parent: str | None = None) -> Proto:
     proto.num_params = file.read_uint8()
     proto.is_vararg = file.read_uint8() != 0
     proto.max_stack_size = file.read_uint8()
+    proto.nil_frame = [Value.nil()] * proto.max_stack_size
 
-    # Code
+    # Code: one bulk read; each Instruction then decodes its own operands once.
+    # A vectorized decode would still need an Instruction per word for the VM,
+    # so it would not remove the per-word construction that dominates here.
     size_codes = file.read_uint32()
-    proto.codes = [read_instruction(file) for _ in range(size_codes)]
+    proto.codes = [Instruction(code) for code in file.read_uint32_array(size_codes)]
 
     # Constants
     size_k = file.read_uint32()
@@ -100,7 +102,4 @@ def read_proto(file: Reader, parent: str | None = None) -> Proto:
     # Debug info
     proto.debug = read_debug(file)
 
-    for pc, code in enumerate(proto.codes):
-        code.update_info(pc, proto.consts, proto.debug.upvalues)
-
     return proto
@@ -73,8 +73,7 @@ def write_proto(file: Writer, proto: Proto) -> None:
 
     # Code
     file.write_uint32(len(proto.codes))
-    for code in proto.codes:
-        write_instruction(file, code)
+    file.write_uint32_array(code.to_bitset() for code in proto.codes)
 
     # Constants
     file.write_uint32(len(proto.consts))
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+from array import array
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from structs.function import LocalVar, Proto
-    from structs.instruction import Instruction
 
 type Const = int | float | str | bool
 
+SBX_BIAS = 131071  # 2^17 - 1, excess-K bias of the 18-bit sBx field
+
 
 class LocalVarInfo:
     name: str
@@ -22,11 +24,7 @@ class LocalVarInfo:
     def to_local_var(self) -> LocalVar:
         from structs.function import LocalVar
 
-        local_var = LocalVar()
-        local_var.name = self.name
-        local_var.start_pc = 0
-        local_var.end_pc = 0
-        return local_var
+        return LocalVar(self.name, 0, 0)
 
 
 class UpvalueInfo:
@@ -59,7 +57,7 @@ class FuncInfo:
     upval_names: dict[str, UpvalueInfo]
     break_jmps_stack: list[list[int]]
 
-    insts: list[Instruction]
+    insts: array[int]  # packed 32-bit instruction words
 
     def __init__(self, parent: FuncInfo | None = None):
         self.parent = parent
@@ -71,7 +69,7 @@ class FuncInfo:
         self.loc_names = {}
         self.upval_names = {}
         self.break_jmps_stack = []
-        self.insts = []
+        self.insts = array("I")
         self.constants = []
         self._const_index: dict[Const, int] = {}  # O(1) constant lookup
         self.used_regs = 0
@@ -79,6 +77,7 @@ class FuncInfo:
 
     def to_proto(self) -> Proto:
         from structs.function import Debug, Proto
+        from structs.instruction import Instruction
         from structs.value import Value
 
         proto = Proto()
@@ -86,10 +85,14 @@ class FuncInfo:
         proto.num_params = self.num_params
         proto.is_vararg = self.is_vararg
         proto.max_stack_size = self.max_regs
+        proto.nil_frame = [Value.nil()] * self.max_regs
         proto.num_upvalues = len(self.upval_names)
-        proto.codes = self.insts.copy()
+        proto.codes = [Instruction(code) for code in self.insts]
         for const in self.constants:
-            proto.consts.append(Value(const))
+            if type(const) is float:
+                proto.consts.append(Value.number(const))
+            else:
+                proto.consts.append(Value(const))
         proto.protos = [sub.to_proto() for sub in self.sub_funcs]
 
         # Debug info
@@ -113,8 +116,9 @@ class FuncInfo:
 
     def idx_of_upval(self, name: str) -> int | None:
         """Get index of upvalue, adding it if not present."""
-        if name in self.upval_names:
-            return self.upval_names[name].idx
+        upval_info = self.upval_names.get(name)
+        if upval_info is not None:
+            return upval_info.idx
 
         loc_idx = None
         upval_idx = None
@@ -134,22 +138,29 @@ class FuncInfo:
     def alloc_reg(self) -> int:
         if self.used_regs >= 255:
             raise RuntimeError("Exceeded maximum register limit (255)")
-        self.used_regs += 1
-        self.max_regs = max(self.max_regs, self.used_regs)
-        return self.used_regs - 1
+        reg = self.used_regs
+        self.used_regs = used = reg + 1
+        if used > self.max_regs:
+            self.max_regs = used
+        return reg
 
     def free_reg(self) -> None:
         assert self.used_regs > 0, "No registers to free"
         self.used_regs -= 1
 
     def alloc_regs(self, n: int) -> int:
-        for _ in range(n):
-            self.alloc_reg()
-        return self.used_regs - n
+        """Allocate n consecutive registers and return the first one."""
+        base = self.used_regs
+        if base + n > 255:
+            raise RuntimeError("Exceeded maximum register limit (255)")
+        self.used_regs = used = base + n
+        if used > self.max_regs:
+            self.max_regs = used
+        return base
 
     def free_regs(self, n: int) -> None:
-        for _ in range(n):
-            self.free_reg()
+        assert self.used_regs >= n, "No registers to free"
+        self.used_regs -= n
 
     def enter_scope(self) -> None:
         """Enter a new variable scope."""
@@ -185,38 +196,42 @@ class FuncInfo:
         return self.upval_names.get(name)
 
     def emit_abc(self, opcode: int, a: int, b: int, c: int) -> None:
-        from structs.instruction import Instruction
-
         """Emit an ABC format instruction."""
-        inst = (opcode & 0x3F) | ((a & 0xFF) << 6) | ((b & 0x1FF) << 23) | ((c & 0x1FF) << 14)
-        self.insts.append(Instruction(inst))
+        # opcode is always an OP_* constant (< 64): only operands need masking
+        inst = opcode | ((a & 0xFF) << 6) | ((b & 0x1FF) << 23) | ((c & 0x1FF) << 14)
+        self.insts.append(inst)
 
     def emit_abx(self, opcode: int, a: int, bx: int) -> None:
-        from structs.instruction import Instruction
-
         """Emit an ABx format instruction."""
-        inst = (opcode & 0x3F) | ((a & 0xFF) << 6) | ((bx & 0x3FFFF) << 14)
-        self.insts.append(Instruction(inst))
+        inst = opcode | ((a & 0xFF) << 6) | ((bx & 0x3FFFF) << 14)
+        self.insts.append(inst)
 
     def emit_asbx(self, opcode: int, a: int, sbx: int) -> None:
-        from structs.instruction import Instruction
-
         """Emit an AsBx format instruction."""
-        bias = 131071  # 2^18 - 1
-        inst = (opcode & 0x3F) | ((a & 0xFF) << 6) | (((sbx + bias) & 0x3FFFF) << 14)
-        self.insts.append(Instruction(inst))
+        inst = opcode | ((a & 0xFF) << 6) | (((sbx + SBX_BIAS) & 0x3FFFF) << 14)
+        self.insts.append(inst)
 
     def emit_ax(self, opcode: int, ax: int) -> None:
-        from structs.instruction import Instruction
-
         """Emit an Ax format instruction."""
-        inst = (opcode & 0x3F) | ((ax & 0x3FFFFFF) << 6)
-        self.insts.append(Instruction(inst))
+        inst = opcode | ((ax & 0x3FFFFFF) << 6)
+        self.insts.append(inst)
 
     def current_pc(self) -> int:
         """Get the current program counter (instruction index)."""
         return len(self.insts)
 
+    def patch_jmp(self, jmp_pc: int, target_pc: int) -> None:
+        """Point the placeholder jump at jmp_pc to target_pc."""
+        sbx = target_pc - jmp_pc - 1
+        self.insts[jmp_pc] = (self.insts[jmp_pc] & 0x3FFF) | (((sbx + SBX_BIAS) & 0x3FFFF) << 14)
+
+    def patch_jmps(self, jmp_pcs: list[int], target_pc: int) -> None:
+        """Point every placeholder jump in jmp_pcs to target_pc in one pass."""
+        insts = self.insts
+        for jmp_pc in jmp_pcs:
+            sbx = target_pc - jmp_pc - 1
+            insts[jmp_pc] = (insts[jmp_pc] & 0x3FFF) | (((sbx + SBX_BIAS) & 0x3FFFF) << 14)
+
     def enter_loop(self) -> None:
         """Begin a loop scope for tracking break jumps."""
         self.break_jmps_stack.append([])
@@ -231,9 +246,7 @@ class FuncInfo:
         """Patch all pending break jumps in current loop to loop exit."""
         if not self.break_jmps_stack:
             return
-        break_jmps = self.break_jmps_stack.pop()
-        for jmp_pc in break_jmps:
-            self.insts[jmp_pc].set_sbx(exit_pc - jmp_pc - 1)
+        self.patch_jmps(self.break_jmps_stack.pop(), exit_pc)
 
     def __str__(self) -> str:
         """Generate a human-readable representation of the function info."""
@@ -246,8 +259,10 @@ class FuncInfo:
         )
 
         # Instructions
-        for i, inst in enumerate(self.insts, 1):
-            lines.append(f"\t{i}\t{inst}")
+        from structs.instruction import Instruction
+
+        for i, code in enumerate(self.insts, 1):
+            lines.append(f"\t{i}\t{Instruction(code)}")
 
         # Constants
         if self.constants:
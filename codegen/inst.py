@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from enum import IntEnum
+from typing import NamedTuple
 
 from .func import Const, FuncInfo
 
@@ -19,16 +20,15 @@ class OpMode(IntEnum):
     iAsBx = 2
 
 
-class OpCode:
+class OpCode(NamedTuple):
     """Lua 5.1 opcode definition with mode information."""
 
-    def __init__(self, name: str, test_flag: int, seta_reg: int, argb: int, argc: int, mode: int):
-        self.name = name
-        self.test_flag = test_flag  # operator is a test (next instruction must be a jump)
-        self.seta_reg = seta_reg  # instruction set register A
-        self.argb = argb  # B arg mode
-        self.argc = argc  # C arg mode
-        self.mode = mode  # op mode (iABC=0, iABx=1, iAsBx=2)
+    name: str
+    test_flag: int  # operator is a test (next instruction must be a jump)
+    seta_reg: int  # instruction set register A
+    argb: int  # B arg mode
+    argc: int  # C arg mode
+    mode: int  # op mode (iABC=0, iABx=1, iAsBx=2)
 
     def __repr__(self):
         return self.name
@@ -80,179 +80,221 @@ OPCODES = [
 
 OP = {opcode.name: idx for idx, opcode in enumerate(OPCODES)}
 
+# Opcode indices as module-level ints, so emitters skip the OP dict lookup
+OP_MOVE = OP["MOVE"]
+OP_LOADK = OP["LOADK"]
+OP_LOADBOOL = OP["LOADBOOL"]
+OP_LOADNIL = OP["LOADNIL"]
+OP_GETUPVAL = OP["GETUPVAL"]
+OP_GETGLOBAL = OP["GETGLOBAL"]
+OP_GETTABLE = OP["GETTABLE"]
+OP_SETGLOBAL = OP["SETGLOBAL"]
+OP_SETUPVAL = OP["SETUPVAL"]
+OP_SETTABLE = OP["SETTABLE"]
+OP_NEWTABLE = OP["NEWTABLE"]
+OP_SELF = OP["SELF"]
+OP_ADD = OP["ADD"]
+OP_SUB = OP["SUB"]
+OP_MUL = OP["MUL"]
+OP_DIV = OP["DIV"]
+OP_MOD = OP["MOD"]
+OP_POW = OP["POW"]
+OP_UNM = OP["UNM"]
+OP_NOT = OP["NOT"]
+OP_LEN = OP["LEN"]
+OP_CONCAT = OP["CONCAT"]
+OP_JMP = OP["JMP"]
+OP_EQ = OP["EQ"]
+OP_LT = OP["LT"]
+OP_LE = OP["LE"]
+OP_TEST = OP["TEST"]
+OP_TESTSET = OP["TESTSET"]
+OP_CALL = OP["CALL"]
+OP_TAILCALL = OP["TAILCALL"]
+OP_RETURN = OP["RETURN"]
+OP_FORLOOP = OP["FORLOOP"]
+OP_FORPREP = OP["FORPREP"]
+OP_TFORLOOP = OP["TFORLOOP"]
+OP_SETLIST = OP["SETLIST"]
+OP_CLOSE = OP["CLOSE"]
+OP_CLOSURE = OP["CLOSURE"]
+OP_VARARG = OP["VARARG"]
+
 
 # ruff:noqa: N802 - Follows Lua's opcode naming convention
 class CodegenInst:
     @staticmethod
     def move(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["MOVE"], a, b, 0)
+        info.emit_abc(OP_MOVE, a, b, 0)
 
     @staticmethod
     def load_k(info: FuncInfo, reg: int, const: Const):
         idx = info.idx_of_const(const)
         if idx < (1 << 18):
-            info.emit_abx(OP["LOADK"], reg, idx)
+            info.emit_abx(OP_LOADK, reg, idx)
         else:
             raise ValueError("Constant index out of range for LOADK instruction")
 
     @staticmethod
     def load_bool(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["LOADBOOL"], a, b, c)
+        info.emit_abc(OP_LOADBOOL, a, b, c)
 
     @staticmethod
     def load_nil(info: FuncInfo, a: int, n: int):
-        info.emit_abc(OP["LOADNIL"], a, a + n - 1, 0)
+        info.emit_abc(OP_LOADNIL, a, a + n - 1, 0)
 
     @staticmethod
     def get_global(info: FuncInfo, a: int, bx: int):
-        info.emit_abx(OP["GETGLOBAL"], a, bx)
+        info.emit_abx(OP_GETGLOBAL, a, bx)
 
     @staticmethod
     def set_global(info: FuncInfo, a: int, bx: int):
-        info.emit_abx(OP["SETGLOBAL"], a, bx)
+        # Lua 5.1 has no _ENV upvalue or SETTABUP: SETGLOBAL is already the single
+        # instruction that stores into the function environment
+        info.emit_abx(OP_SETGLOBAL, a, bx)
 
     @staticmethod
     def get_table(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["GETTABLE"], a, b, c)
+        info.emit_abc(OP_GETTABLE, a, b, c)
 
     @staticmethod
     def set_table(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["SETTABLE"], a, b, c)
+        info.emit_abc(OP_SETTABLE, a, b, c)
 
     @staticmethod
     def new_table(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["NEWTABLE"], a, b, c)
+        info.emit_abc(OP_NEWTABLE, a, b, c)
 
     @staticmethod
     def set_list(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["SETLIST"], a, b, c)
+        info.emit_abc(OP_SETLIST, a, b, c)
 
     @staticmethod
     def jmp(info: FuncInfo, sbx: int):
-        info.emit_asbx(OP["JMP"], 0, sbx)
+        info.emit_asbx(OP_JMP, 0, sbx)
 
     @staticmethod
     def ret(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["RETURN"], a, b, 0)
+        info.emit_abc(OP_RETURN, a, b, 0)
 
     @staticmethod
     def closure(info: FuncInfo, a: int, bx: int):
-        info.emit_abx(OP["CLOSURE"], a, bx)
+        info.emit_abx(OP_CLOSURE, a, bx)
 
     @staticmethod
     # num_args: number of arguments
     # num_rets: number of expected return values, -1 for variable
     def call(info: FuncInfo, a: int, num_args: int, num_rets: int):
-        info.emit_abc(OP["CALL"], a, num_args + 1, num_rets + 1)
+        info.emit_abc(OP_CALL, a, num_args + 1, num_rets + 1)
 
     @staticmethod
     def get_upval(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["GETUPVAL"], a, b, 0)
+        info.emit_abc(OP_GETUPVAL, a, b, 0)
 
     @staticmethod
     def set_upval(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["SETUPVAL"], a, b, 0)
+        info.emit_abc(OP_SETUPVAL, a, b, 0)
 
     @staticmethod
     def vararg(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["VARARG"], a, b, 0)
+        info.emit_abc(OP_VARARG, a, b, 0)
 
     @staticmethod
     def self_(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["SELF"], a, b, c)
+        info.emit_abc(OP_SELF, a, b, c)
 
     @staticmethod
     def concat(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["CONCAT"], a, b, c)
+        info.emit_abc(OP_CONCAT, a, b, c)
 
     @staticmethod
     def test(info: FuncInfo, a: int, c: int):
-        info.emit_abc(OP["TEST"], a, 0, c)
+        info.emit_abc(OP_TEST, a, 0, c)
 
     @staticmethod
     def testset(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["TESTSET"], a, b, c)
+        info.emit_abc(OP_TESTSET, a, b, c)
 
     @staticmethod
     def forprep(info: FuncInfo, a: int, sbx: int):
-        info.emit_asbx(OP["FORPREP"], a, sbx)
+        info.emit_asbx(OP_FORPREP, a, sbx)
 
     @staticmethod
     def forloop(info: FuncInfo, a: int, sbx: int):
-        info.emit_asbx(OP["FORLOOP"], a, sbx)
+        info.emit_asbx(OP_FORLOOP, a, sbx)
 
     @staticmethod
     def tforloop(info: FuncInfo, a: int, c: int):
-        info.emit_abc(OP["TFORLOOP"], a, 0, c)
+        info.emit_abc(OP_TFORLOOP, a, 0, c)
 
     @staticmethod
     def PLUS(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["ADD"], a, b, c)
+        info.emit_abc(OP_ADD, a, b, c)
 
     @staticmethod
     def MINUS(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["SUB"], a, b, c)
+        info.emit_abc(OP_SUB, a, b, c)
 
     @staticmethod
     def MULTIPLY(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["MUL"], a, b, c)
+        info.emit_abc(OP_MUL, a, b, c)
 
     @staticmethod
     def DIVIDE(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["DIV"], a, b, c)
+        info.emit_abc(OP_DIV, a, b, c)
 
     @staticmethod
     def MOD(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["MOD"], a, b, c)
+        info.emit_abc(OP_MOD, a, b, c)
 
     @staticmethod
     def POW(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["POW"], a, b, c)
+        info.emit_abc(OP_POW, a, b, c)
 
     @staticmethod
     def UNM(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["UNM"], a, b, 0)
+        info.emit_abc(OP_UNM, a, b, 0)
 
     @staticmethod
     def NOT(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["NOT"], a, b, 0)
+        info.emit_abc(OP_NOT, a, b, 0)
 
     @staticmethod
     def LEN(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["LEN"], a, b, 0)
+        info.emit_abc(OP_LEN, a, b, 0)
 
     # Comparison operators
     @staticmethod
     def EQ(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["EQ"], a, b, c)
+        info.emit_abc(OP_EQ, a, b, c)
 
     @staticmethod
     def LT(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["LT"], a, b, c)
+        info.emit_abc(OP_LT, a, b, c)
 
     @staticmethod
     def LE(info: FuncInfo, a: int, b: int, c: int):
-        info.emit_abc(OP["LE"], a, b, c)
+        info.emit_abc(OP_LE, a, b, c)
 
     @staticmethod
     def GT(info: FuncInfo, a: int, b: int, c: int):
         # GT(a, B, C) ≡ LT(a, C, B): B > C ⟺ C < B
-        info.emit_abc(OP["LT"], a, c, b)
+        info.emit_abc(OP_LT, a, c, b)
 
     @staticmethod
     def GE(info: FuncInfo, a: int, b: int, c: int):
         # GE(a, B, C) ≡ LE(a, C, B): B >= C ⟺ C <= B
-        info.emit_abc(OP["LE"], a, c, b)
+        info.emit_abc(OP_LE, a, c, b)
 
     @staticmethod
     def NE(info: FuncInfo, a: int, b: int, c: int):
         # NE(a, B, C) ≡ EQ(1-a, B, C): invert a
-        info.emit_abc(OP["EQ"], 1 - a, b, c)
+        info.emit_abc(OP_EQ, 1 - a, b, c)
 
     @staticmethod
     def close(info: FuncInfo, a: int):
-        info.emit_abc(OP["CLOSE"], a, 0, 0)
+        info.emit_abc(OP_CLOSE, a, 0, 0)
 
     @staticmethod
     def tailcall(info: FuncInfo, a: int, b: int):
-        info.emit_abc(OP["TAILCALL"], a, b, 0)
+        info.emit_abc(OP_TAILCALL, a, b, 0)
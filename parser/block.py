@@ -6,8 +6,10 @@ from typing import Any
 from codegen.func import FuncInfo
 from codegen.inst import CodegenInst
 
+from . import expr, stat
 from .expr import Expr
 from .lexer import Lexer
+from .serialize import compile_asdict
 from .stat import ReturnStmt, Stmt
 
 
@@ -47,15 +49,27 @@ class Block:
             info.free_regs(num_rets)
 
     def to_dict(self) -> dict[str, Any]:
-        from .serialize import asdict
-
-        return asdict(self)
+        return _block_to_dict(self)
 
     def __str__(self) -> str:
         return json.dumps(self.to_dict(), indent="  ", ensure_ascii=False)
 
 
+_block_to_dict = compile_asdict(Block)
+
+# Parse methods in expr/stat refer to Block as a module global; bind it once here.
+expr._set_block_cls(Block)
+stat._set_block_cls(Block)
+
+
 class Parser:
+    """Predictive recursive-descent parser for a Lua chunk.
+
+    Every production is chosen from the current token (plus at most one token
+    of lookahead) and never backtracks, so each token is parsed exactly once
+    and no per-position memo table is needed.
+    """
+
     block: Block
 
     def __init__(self, block: Block):
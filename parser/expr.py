@@ -5,15 +5,18 @@ This module defines all expression types in Lua and their parsing logic.
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from .block import Block
     from .lexer import Lexer
-    from .stat import Block
 
 from codegen.func import FuncInfo
 from codegen.inst import CodegenInst
 
+from .serialize import asdict, compile_asdict
+
 # Operator precedence table (higher number = higher precedence)
 BINARY_PRECEDENCE = {
     "OR": 1,
@@ -43,10 +46,22 @@ BINARY_PRECEDENCE = {
 UNARY_PRECEDENCE = 12  # Unary operators have higher precedence than all binary
 
 
+def parse_comma_list[T](lexer: Lexer, parse_one: Callable[[Lexer], T], items: list[T]) -> list[T]:
+    """Parse the `{',' item}` tail of a list, appending to items (already-parsed head)."""
+    current_type = lexer.current_type
+    consume = lexer.consume
+    while current_type() == "COMMA":
+        consume()
+        items.append(parse_one(lexer))
+    return items
+
+
 class Expr:
-    def to_dict(self) -> dict[str, Any]:
-        from .serialize import asdict
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.to_dict = compile_asdict(cls)  # type: ignore[method-assign]
 
+    def to_dict(self) -> dict[str, Any]:
         return asdict(self)
 
     @classmethod
@@ -55,38 +70,33 @@ class Expr:
 
     @staticmethod
     def parse_list(lexer: Lexer) -> list[Expr]:
-        exps = [Expr.parse(lexer)]
-        while lexer.current().type == "COMMA":
-            lexer.consume()
-            exps.append(Expr.parse(lexer))
-
-        return exps
+        return parse_comma_list(lexer, Expr.parse, [Expr.parse(lexer)])
 
     @staticmethod
     def parse_prefix(lexer: Lexer) -> Expr:
         """Parse a prefix expression (identifier or parenthesized)."""
-        token = lexer.current()
+        token_type = lexer.current_type()
         exp: Expr
-        if token.type == "IDENTIFIER":
+        if token_type == "IDENTIFIER":
             exp = NameExpr.parse(lexer)
-        elif token.type == "LPAREN":
+        elif token_type == "LPAREN":
             lexer.consume("LPAREN")
             exp = Expr.parse(lexer)
             lexer.consume("RPAREN")
         else:
-            raise SyntaxError(f"Unexpected token in prefix expression: {token.type}")
+            raise SyntaxError(f"Unexpected token in prefix expression: {token_type}")
 
         return Expr.parse_postfix(lexer, exp)
 
     @staticmethod
     def parse_postfix(lexer: Lexer, expr: Expr) -> Expr:
         """Parse postfix operators (field access, indexing, function calls)."""
-        while token := lexer.current():
-            if token.type == "LBRACKET":
+        while token_type := lexer.current_type():
+            if token_type == "LBRACKET":
                 expr = TableAccessExpr.parse_bracket(lexer, expr)
-            elif token.type == "DOT":
+            elif token_type == "DOT":
                 expr = TableAccessExpr.parse_dot(lexer, expr)
-            elif token.type in ("COLON", "LPAREN", "LBRACE", "STRING"):
+            elif token_type in ("COLON", "LPAREN", "LBRACE", "STRING"):
                 expr = FuncCallExpr.parse_func(lexer, expr)
             else:
                 return expr
@@ -98,13 +108,13 @@ class Expr:
         """Parse sub-expression with operator precedence climbing algorithm."""
         # Parse unary operators or simple expression
         exp: Expr
-        if lexer.current().type in ("NOT", "MINUS", "LEN", "BXOR"):
+        if lexer.current_type() in ("NOT", "MINUS", "LEN", "BXOR"):
             exp = UnaryOpExpr.parse(lexer)
         else:
             exp = Expr._parse_simple_exp(lexer)
 
         # Parse binary operators with precedence
-        while (op := lexer.current().type) and (lbp := BINARY_PRECEDENCE.get(op, -1)) > limit:
+        while (op := lexer.current_type()) and (lbp := BINARY_PRECEDENCE.get(op, -1)) > limit:
             lexer.consume()  # consume operator
             # Right associative operators (POW, CONCAT) use lbp-1
             rbp = lbp - 1 if op in ("POW", "CONCAT") else lbp
@@ -114,45 +124,45 @@ class Expr:
 
     @staticmethod
     def _parse_simple_exp(lexer: Lexer) -> Expr:
-        token = lexer.current()
+        token_type = lexer.current_type()
 
         # Literal tokens
-        if token.type == "NIL":
+        if token_type == "NIL":
             return NilExpr.parse(lexer)
-        elif token.type == "TRUE":
+        elif token_type == "TRUE":
             return TrueExpr.parse(lexer)
-        elif token.type == "FALSE":
+        elif token_type == "FALSE":
             return FalseExpr.parse(lexer)
-        elif token.type == "VARARG":
+        elif token_type == "VARARG":
             return VarargExpr.parse(lexer)
 
         # Numbers
-        elif token.type == "NUMBER":
+        elif token_type == "NUMBER":
             # TODO: Distinguish integer vs float
             return Expr.parse_number(lexer)
 
         # Strings
-        elif token.type == "STRING":
+        elif token_type == "STRING":
             return StringExpr.parse(lexer)
 
         # Table constructor
-        elif token.type == "LBRACE":
+        elif token_type == "LBRACE":
             return TableConstructorExpr.parse(lexer)
 
         # Anonymous Function
-        elif token.type == "FUNCTION":
+        elif token_type == "FUNCTION":
             lexer.consume("FUNCTION")
             return FuncDefExpr.parse(lexer)
 
         # Parenthesized expression
-        elif token.type == "LPAREN":
+        elif token_type == "LPAREN":
             return ParenExpr.parse(lexer)
 
         # Identifier (with potential postfix)
-        elif token.type == "IDENTIFIER":
+        elif token_type == "IDENTIFIER":
             return Expr.parse_postfix(lexer, NameExpr.parse(lexer))
         else:
-            raise SyntaxError(f"Unexpected token: {token.type}")
+            raise SyntaxError(f"Unexpected token: {token_type}")
 
     @classmethod
     def parse_number(cls, lexer: Lexer) -> Expr:
@@ -286,8 +296,12 @@ class NameExpr(Expr):
 
     @classmethod
     def parse(cls, lexer: Lexer) -> NameExpr:
-        token = lexer.consume("IDENTIFIER")
-        return cls(token.value)
+        name = lexer.consume("IDENTIFIER").value
+        # NameExpr nodes carry no per-site state, so repeated identifiers in one parse share a node
+        exp = lexer.name_exprs.get(name)
+        if exp is None:
+            exp = lexer.name_exprs[name] = cls(name)
+        return exp
 
     def codegen(self, info: FuncInfo, reg: int, cnt: int = 1):
         loc_var = info.get_local_var(self.name)
@@ -302,10 +316,35 @@ class NameExpr(Expr):
         CodegenInst.get_global(info, reg, idx)
 
 
+_SELF_NAME_EXPR = NameExpr("self")
+
+
 # ============================================================================
 # Operator Expressions
 # ============================================================================
 
+# Operator token -> CodegenInst emitter, resolved once at import instead of per node
+_UNARY_EMITTERS: dict[str, Callable[..., None]] = {
+    op: getattr(CodegenInst, op) for op in ("UNM", "NOT", "LEN")
+}
+_BINARY_EMITTERS: dict[str, Callable[..., None]] = {
+    op: getattr(CodegenInst, op)
+    for op in (
+        "PLUS",
+        "MINUS",
+        "MULTIPLY",
+        "DIVIDE",
+        "MOD",
+        "POW",
+        "EQ",
+        "NE",
+        "LT",
+        "LE",
+        "GT",
+        "GE",
+    )
+}
+
 
 class UnaryOpExpr(Expr):
     """Unary operator expression (not, -, #, ~)."""
@@ -329,7 +368,7 @@ class UnaryOpExpr(Expr):
         operand_reg = info.alloc_reg()
         self.expr.codegen(info, operand_reg)
 
-        op_func = getattr(CodegenInst, self.op)
+        op_func = _UNARY_EMITTERS.get(self.op)
         if op_func:
             op_func(info, reg, operand_reg)
         else:
@@ -365,7 +404,7 @@ class BinaryOpExpr(Expr):
 
             start_reg = info.alloc_regs(len(exprs))
             for i, e in enumerate(exprs):
-                e.codegen(info, start_reg + i)
+                codegen(e, info, start_reg + i)
 
             CodegenInst.concat(info, reg, start_reg, start_reg + len(exprs) - 1)
             info.free_regs(len(exprs))
@@ -386,8 +425,7 @@ class BinaryOpExpr(Expr):
             info.free_reg()
 
             # Patch JMP to jump past right side
-            pc_end = info.current_pc()
-            info.insts[pc_jmp].set_sbx(pc_end - pc_jmp - 1)
+            info.patch_jmp(pc_jmp, info.current_pc())
 
         elif self.op in ("EQ", "NE", "LT", "LE", "GT", "GE"):
             # Comparison operators - result in boolean
@@ -395,7 +433,7 @@ class BinaryOpExpr(Expr):
             right_reg = info.alloc_reg()
             self.right.codegen(info, right_reg)
 
-            op_func = getattr(CodegenInst, self.op)
+            op_func = _BINARY_EMITTERS.get(self.op)
             if op_func:
                 op_func(info, 1, reg, right_reg)  # Compare and skip if true
                 CodegenInst.jmp(info, 1)  # Skip next instruction
@@ -408,7 +446,7 @@ class BinaryOpExpr(Expr):
             right_reg = info.alloc_reg()
             self.right.codegen(info, right_reg)
 
-            op_func = getattr(CodegenInst, self.op)
+            op_func = _BINARY_EMITTERS.get(self.op)
             if op_func:
                 op_func(info, reg, reg, right_reg)
             else:
@@ -454,10 +492,10 @@ class TableConstructorExpr(Expr):
         key_exps: list[Expr | None] = []
         val_exps: list[Expr] = []
         lexer.consume("LBRACE")
-        while lexer.current().type != "RBRACE":
+        while lexer.current_type() != "RBRACE":
             cls._parse_field(lexer, key_exps, val_exps)
 
-            if lexer.current().type in ("COMMA", "SEMICOLON"):
+            if lexer.current_type() in ("COMMA", "SEMICOLON"):
                 lexer.consume()
             else:
                 break
@@ -467,26 +505,8 @@ class TableConstructorExpr(Expr):
 
     @staticmethod
     def _parse_field(lexer: Lexer, key_exps: list[Expr | None], val_exps: list[Expr]) -> None:
-        if lexer.current().type == "LBRACKET":
-            # [exp] = exp
-            lexer.consume("LBRACKET")
-            key_exps.append(Expr.parse(lexer))
-            lexer.consume("RBRACKET")
-            lexer.consume("ASSIGN")
-            val_exps.append(Expr.parse(lexer))
-        else:
-            exp = Expr.parse(lexer)
-            if lexer.current().type == "ASSIGN":
-                # name = exp
-                if type(exp) is NameExpr:
-                    exp = StringExpr(exp.name)
-                lexer.consume("ASSIGN")
-                key_exps.append(exp)
-                val_exps.append(Expr.parse(lexer))
-            else:
-                # exp (array-style)
-                key_exps.append(None)
-                val_exps.append(exp)
+        parse_field = _FIELD_PARSERS.get(lexer.current_type(), _parse_assign_or_array_field)
+        parse_field(lexer, key_exps, val_exps)
 
     def codegen(self, info: FuncInfo, reg: int, cnt: int = 1):
         # Separate array-style (key is None) and hash-style entries
@@ -505,9 +525,9 @@ class TableConstructorExpr(Expr):
         # Emit hash-style entries with SETTABLE
         for key, val in zip(hash_keys, hash_vals, strict=True):
             key_reg = info.alloc_reg()
-            key.codegen(info, key_reg)
+            codegen(key, info, key_reg)
             val_reg = info.alloc_reg()
-            val.codegen(info, val_reg)
+            codegen(val, info, val_reg)
             CodegenInst.set_table(info, reg, key_reg, val_reg)
             info.free_regs(2)
 
@@ -520,7 +540,7 @@ class TableConstructorExpr(Expr):
             info.used_regs = reg + 1
             batch_regs = info.alloc_regs(len(batch))
             for i, val in enumerate(batch):
-                val.codegen(info, batch_regs + i)
+                codegen(val, info, batch_regs + i)
             block = batch_start // fields_per_flush + 1  # 1-based block number
             CodegenInst.set_list(info, reg, len(batch), block)
             info.used_regs = saved_used
@@ -595,7 +615,7 @@ class FuncCallExpr(Expr):
     def parse_func(cls, lexer: Lexer, prefix_expr: Expr) -> FuncCallExpr:
         """Parse function call: func(args) or obj:method(args)."""
         name_expr = None
-        if lexer.current().type == "COLON":
+        if lexer.current_type() == "COLON":
             lexer.consume("COLON")
             name_expr = NameExpr.parse(lexer)
 
@@ -605,19 +625,7 @@ class FuncCallExpr(Expr):
     @staticmethod
     def _parse_args(lexer: Lexer) -> list[Expr]:
         """Parse function arguments."""
-        token = lexer.current()
-
-        if token.type == "LPAREN":
-            lexer.consume("LPAREN")
-            args = Expr.parse_list(lexer) if lexer.current().type != "RPAREN" else []
-            lexer.consume("RPAREN")
-            return args
-        elif token.type == "LBRACE":
-            return [TableConstructorExpr.parse(lexer)]
-        elif token.type == "STRING":
-            return [StringExpr.parse(lexer)]
-        else:
-            return []
+        return _ARG_PARSERS.get(lexer.current_type(), _parse_empty_args)(lexer)
 
     # cnt: return count
     def codegen(self, info: FuncInfo, reg: int = -1, cnt: int = 1):
@@ -648,10 +656,7 @@ class FuncCallExpr(Expr):
         # When an argument is a function call, it should expect 1 return value
         arg_base = func_reg + (2 if self.name_expr else 1)
         for i, arg in enumerate(self.args):
-            if isinstance(arg, FuncCallExpr):
-                arg.codegen(info, arg_base + i, cnt=1)
-            else:
-                arg.codegen(info, arg_base + i)
+            codegen(arg, info, arg_base + i)
 
         nargs = len(self.args) + (1 if self.name_expr else 0)  # +1 for self
         CodegenInst.call(info, func_reg, nargs, cnt)
@@ -678,20 +683,18 @@ class FuncDefExpr(Expr):
 
     @classmethod
     def parse(cls, lexer: Lexer, colon: bool = False) -> FuncDefExpr:
-        from .block import Block
-
         lexer.consume("LPAREN")
 
-        param_names = [NameExpr("self")] if colon else []
+        param_names = [_SELF_NAME_EXPR] if colon else []
 
         # Parse parameters
-        while lexer.current().type == "IDENTIFIER":
+        while lexer.current_type() == "IDENTIFIER":
             param_names.append(NameExpr.parse(lexer))
-            if lexer.current().type == "COMMA":
+            if lexer.current_type() == "COMMA":
                 lexer.consume("COMMA")
 
         is_vararg = False
-        if lexer.current().type == "VARARG":
+        if lexer.current_type() == "VARARG":
             VarargExpr.parse(lexer)
             is_vararg = True
 
@@ -703,6 +706,8 @@ class FuncDefExpr(Expr):
         return cls(param_names, is_vararg, body)
 
     def codegen(self, info: FuncInfo, reg: int, cnt: int = 1):
+        # Generated inline rather than in a worker pool: upvalue resolution walks the
+        # live parent FuncInfo chain, so a nested body cannot be compiled in isolation
         func_info = FuncInfo(parent=info)
         func_info.num_params = len(self.param_names)
         func_info.is_vararg = self.is_vararg
@@ -723,3 +728,103 @@ class FuncDefExpr(Expr):
         info.sub_funcs.append(func_info)
 
         CodegenInst.closure(info, reg, idx)
+
+
+def _set_block_cls(cls: type[Block]) -> None:
+    """Bind Block once parser.block has loaded, breaking the import cycle."""
+    global Block
+    Block = cls  # type: ignore[misc]
+
+
+# ============================================================================
+# Fixed-shape Production Tables
+# ============================================================================
+
+
+def _parse_bracket_field(lexer: Lexer, key_exps: list[Expr | None], val_exps: list[Expr]) -> None:
+    """[exp] = exp"""
+    lexer.consume("LBRACKET")
+    key_exps.append(Expr.parse(lexer))
+    lexer.consume("RBRACKET")
+    lexer.consume("ASSIGN")
+    val_exps.append(Expr.parse(lexer))
+
+
+def _parse_assign_or_array_field(
+    lexer: Lexer, key_exps: list[Expr | None], val_exps: list[Expr]
+) -> None:
+    """name = exp, or a bare exp (array-style)."""
+    exp = Expr.parse(lexer)
+    if lexer.current_type() == "ASSIGN":
+        if type(exp) is NameExpr:
+            exp = StringExpr(exp.name)
+        lexer.consume("ASSIGN")
+        key_exps.append(exp)
+        val_exps.append(Expr.parse(lexer))
+    else:
+        key_exps.append(None)
+        val_exps.append(exp)
+
+
+def _parse_paren_args(lexer: Lexer) -> list[Expr]:
+    lexer.consume("LPAREN")
+    args = Expr.parse_list(lexer) if lexer.current_type() != "RPAREN" else []
+    lexer.consume("RPAREN")
+    return args
+
+
+def _parse_brace_args(lexer: Lexer) -> list[Expr]:
+    return [TableConstructorExpr.parse(lexer)]
+
+
+def _parse_string_args(lexer: Lexer) -> list[Expr]:
+    return [StringExpr.parse(lexer)]
+
+
+def _parse_empty_args(lexer: Lexer) -> list[Expr]:
+    return []
+
+
+# Current token type -> parse continuation
+_FIELD_PARSERS: dict[str, Callable[[Lexer, list[Expr | None], list[Expr]], None]] = {
+    "LBRACKET": _parse_bracket_field,
+}
+
+_ARG_PARSERS: dict[str, Callable[[Lexer], list[Expr]]] = {
+    "LPAREN": _parse_paren_args,
+    "LBRACE": _parse_brace_args,
+    "STRING": _parse_string_args,
+}
+
+
+# ============================================================================
+# Codegen Dispatch
+# ============================================================================
+
+# Precomputed class -> codegen table; skips the bound-method/MRO lookup on
+# polymorphic call-sites that visit many child nodes.
+_CODEGEN: dict[type[Expr], Callable[..., None]] = {
+    cls: cls.codegen
+    for cls in (
+        NilExpr,
+        TrueExpr,
+        FalseExpr,
+        VarargExpr,
+        IntegerExpr,
+        FloatExpr,
+        StringExpr,
+        NameExpr,
+        UnaryOpExpr,
+        BinaryOpExpr,
+        ParenExpr,
+        TableConstructorExpr,
+        TableAccessExpr,
+        FuncCallExpr,
+        FuncDefExpr,
+    )
+}
+
+
+def codegen(node: Expr, info: FuncInfo, reg: int, cnt: int = 1) -> None:
+    """Generate code for an expression node via the class dispatch table."""
+    _CODEGEN[type(node)](node, info, reg, cnt)
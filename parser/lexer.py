@@ -1,5 +1,13 @@
 from __future__ import annotations
 
+import sys
+from collections import deque
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .expr import NameExpr
+
 TOKEN_TYPE = {
     "+": "PLUS",
     "-": "MINUS",
@@ -48,6 +56,12 @@ KEYWORDS = {
     "while",
 }
 
+# Keyword -> interned token type, so identifier scanning is a single dict probe
+_KW_MAP = {kw: sys.intern(kw.upper()) for kw in KEYWORDS}
+_IDENT = sys.intern("IDENTIFIER")
+
+TOKEN_TYPE = {char: sys.intern(name) for char, name in TOKEN_TYPE.items()}
+
 
 class Token:
     type: str
@@ -73,12 +87,16 @@ class Lexer:
     chunk: str
     chunk_name: str
     pos: int
-    tokens: list[Token]
+    _cur: Token
+    _tokens: Iterator[Token]
+    _ahead: deque[Token]
+    name_exprs: dict[str, NameExpr]  # shared NameExpr per identifier, for this parse only
 
     def __init__(self, chunk: str, chunk_name: str = ""):
         self.chunk = chunk
         self.chunk_name = chunk_name
         self.pos = 0
+        self.name_exprs = {}
         self.tokenize()
 
     @classmethod
@@ -92,12 +110,20 @@ class Lexer:
         return cls(code, name)
 
     def tokenize(self) -> None:
-        self.tokens = []
+        """Start the token stream; tokens are scanned lazily as the parser consumes them."""
         self._line = 1
         self._chunk_pos = 0
+        self._tokens = self._iter_tokens()
+        self._ahead = deque()
+        self._cur = next(self._tokens)
+
+    def _iter_tokens(self) -> Iterator[Token]:
         while not self.is_eof():
-            token = self._next_token()
-            self.tokens.append(token)
+            yield self._next_token()
+        # Endless EOF sentinel: consume() never needs a bounds check
+        eof = Token("EOF", "", self._line)
+        while True:
+            yield eof
 
     def _scan_token(self) -> Token:
         """Scan and return the next token from the input stream.
@@ -247,28 +273,31 @@ class Lexer:
         """Get the next non-comment token.
 
         Wraps _scan_token() to filter out comment tokens during tokenization.
-        This is the interface used by the tokenize() method.
+        This is the interface used by the _iter_tokens() generator.
         """
         while (token := self._scan_token()).type == "COMMENT":
             pass
         return token
 
     def current(self) -> Token:
-        if self.pos >= len(self.tokens):
-            return Token("EOF", "", self._line)
-        return self.tokens[self.pos]
+        return self._cur
+
+    def current_type(self) -> str:
+        return self._cur.type
 
     def lookahead(self) -> Token:
-        assert self.pos + 1 < len(self.tokens), "No more tokens to lookahead"
-        return self.tokens[self.pos + 1]
+        if not self._ahead:
+            self._ahead.append(next(self._tokens))
+        return self._ahead[0]
 
     def consume(self, expect: str | None = None) -> Token:
-        token = self.current()
-        if expect and token.type != expect:
+        token = self._cur
+        if expect is not None and token.type != expect:
             raise SyntaxError(
                 f"{self.chunk_name}:{token.line}: expected '{expect}' but got '{token.type}'"
             )
         self.pos += 1
+        self._cur = self._ahead.popleft() if self._ahead else next(self._tokens)
         return token
 
     def read_identifier(self) -> Token:
@@ -279,9 +308,10 @@ class Lexer:
             self.advance_char()
         value = self.chunk[start_pos : self._chunk_pos]
         # Check if it's a keyword
-        if value in KEYWORDS:
-            return Token(value.upper(), value, self._line)
-        return Token("IDENTIFIER", value, self._line)
+        token_type = _KW_MAP.get(value)
+        if token_type is not None:
+            return Token(token_type, value, self._line)
+        return Token(_IDENT, value, self._line)
 
     def read_number(self) -> Token:
         start_pos = self._chunk_pos
@@ -6,6 +6,7 @@ and other common operations.
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -14,17 +15,27 @@ if TYPE_CHECKING:
     from .stat import Stmt
 
 
+# (Expr, Stmt, Block), bound on first use: those modules import this one
+_NODE_TYPES: tuple[type[Expr], type[Stmt], type[Block]] | None = None
+
+
+def _node_types() -> tuple[type[Expr], type[Stmt], type[Block]]:
+    global _NODE_TYPES
+    if _NODE_TYPES is None:
+        from .block import Block
+        from .expr import Expr
+        from .stat import Stmt
+
+        _NODE_TYPES = (Expr, Stmt, Block)
+    return _NODE_TYPES
+
+
 def convert_value(value: Any) -> Any:
     """Recursively convert a value to a JSON-serializable form.
 
     Handles AST nodes, lists, tuples, and primitive values.
     """
-    # Import here to avoid circular dependencies
-    from .block import Block
-    from .expr import Expr
-    from .stat import Stmt
-
-    if isinstance(value, (Expr, Stmt, Block)):
+    if isinstance(value, _NODE_TYPES or _node_types()):
         return value.to_dict()
     elif isinstance(value, list):
         return [convert_value(item) for item in value]  # type: ignore[misc]
@@ -52,8 +63,39 @@ def asdict(obj: Expr | Stmt | Block) -> dict[str, Any]:
             if hasattr(obj, key):
                 result[key] = convert_value(getattr(obj, key))
     else:
-        # Fall back to all instance attributes
-        for key, value in obj.__dict__.items():
+        # Fall back to all instance attributes (slotted nodes have no __dict__)
+        for key, value in getattr(obj, "__dict__", {}).items():
             result[key] = convert_value(value)
 
     return result
+
+
+def node_fields(cls: type) -> tuple[str, ...]:
+    """Return the serialized fields of an AST node class.
+
+    Uses the _fields tuple if defined, otherwise the public annotated
+    attributes collected along the MRO.
+    """
+    fields = getattr(cls, "_fields", None)
+    if fields is not None:
+        return tuple(fields)
+    names: dict[str, None] = {}
+    for klass in reversed(cls.__mro__):
+        for name in vars(klass).get("__annotations__", {}):
+            if not name.startswith("_"):
+                names[name] = None
+    return tuple(names)
+
+
+def compile_asdict(cls: type) -> Callable[..., dict[str, Any]]:
+    """Build a straight-line to_dict for cls with its field names baked in.
+
+    Equivalent to asdict() but skips the per-call reflection over fields.
+    """
+    items = "".join(f", {name!r}: _conv(self.{name})" for name in node_fields(cls))
+    source = f"def to_dict(self):\n    return {{'type': {cls.__name__!r}{items}}}\n"
+    namespace: dict[str, Any] = {}
+    exec(source, {"_conv": convert_value}, namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    return to_dict
@@ -6,10 +6,26 @@ logic.
 
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 from typing import TYPE_CHECKING, Any
 
-from .expr import Expr, FuncCallExpr, FuncDefExpr, NameExpr, TableAccessExpr, TrueExpr
+from .expr import (
+    Expr,
+    FalseExpr,
+    FloatExpr,
+    FuncCallExpr,
+    FuncDefExpr,
+    IntegerExpr,
+    NameExpr,
+    NilExpr,
+    StringExpr,
+    TableAccessExpr,
+    TrueExpr,
+    UnaryOpExpr,
+    parse_comma_list,
+)
 from .lexer import Lexer
+from .serialize import asdict, compile_asdict
 
 if TYPE_CHECKING:
     from .block import Block
@@ -17,72 +33,76 @@ if TYPE_CHECKING:
 from codegen.func import FuncInfo
 from codegen.inst import CodegenInst
 
+# Emitters bound once at import; saves a class attribute lookup per emitted instruction
+_forloop = CodegenInst.forloop
+_forprep = CodegenInst.forprep
+_jmp = CodegenInst.jmp
+_load_k = CodegenInst.load_k
+_load_nil = CodegenInst.load_nil
+_move = CodegenInst.move
+_set_global = CodegenInst.set_global
+_set_upval = CodegenInst.set_upval
+_test = CodegenInst.test
+_tforloop = CodegenInst.tforloop
+
+# Expressions whose codegen writes the target register once, after reading all operands
+# from fresh temporaries, so they may target a live local directly (`x = -x` is safe,
+# `x = y + x` is not: binary operators build the left operand in the target first)
+_DIRECT_STORE_EXPRS: frozenset[type[Expr]] = frozenset(
+    (
+        NilExpr,
+        TrueExpr,
+        FalseExpr,
+        IntegerExpr,
+        FloatExpr,
+        StringExpr,
+        NameExpr,
+        UnaryOpExpr,
+        TableAccessExpr,
+        FuncDefExpr,
+    )
+)
+
 
 class Stmt:
     """Base class for all Lua statements."""
 
+    # Leading token type -> statement parser, populated at module bottom
+    _DISPATCH: dict[str, Callable[[Lexer], Stmt]]
+
+    __slots__ = ()
+
     @classmethod
     def parse(cls, lexer: Lexer) -> Stmt:
         """Parse a statement based on the current token."""
-        token = lexer.current()
-
-        # Empty statement
-        if token.type == "SEMICOLON":
-            return EmptyStmt.parse(lexer)
-
-        # Break statement
-        elif token.type == "BREAK":
-            return BreakStmt.parse(lexer)
-
-        # Do block
-        elif token.type == "DO":
-            return DoStmt.parse(lexer)
-
-        # While loop
-        elif token.type == "WHILE":
-            return WhileStmt.parse(lexer)
-
-        # Repeat-until loop
-        elif token.type == "REPEAT":
-            return RepeatStmt.parse(lexer)
-
-        # If statement
-        elif token.type == "IF":
-            return IfStmt.parse(lexer)
+        token_type = lexer.current_type()
 
-        # For loop (numeric or iterator)
-        elif token.type == "FOR":
-            return ForStmt.parse(lexer)
-
-        # Function definition
-        elif token.type == "FUNCTION":
-            return AssignStmt.parse_func(lexer)
-
-        # Local declaration
-        elif token.type == "LOCAL":
-            return LocalStmt.parse(lexer)
+        handler = Stmt._DISPATCH.get(token_type)
+        if handler is not None:
+            return handler(lexer)
 
         # Return statement (should not be called directly)
-        elif token.type == "RETURN":
+        if token_type == "RETURN":
             raise NotImplementedError(
                 "Return statements should be parsed using ReturnStmt.parse_list"
             )
 
         # Assignment or function call
-        else:
-            prefix = Expr.parse_prefix(lexer)
-            if type(prefix) is FuncCallExpr:
-                return FuncCallStmt(prefix)
-            return AssignStmt.parse_with_first(lexer, prefix)
+        prefix = Expr.parse_prefix(lexer)
+        if type(prefix) is FuncCallExpr:
+            return FuncCallStmt(prefix)
+        return AssignStmt.parse_with_first(lexer, prefix)
 
     def codegen(self, info: FuncInfo):
         """Generate code for the statement."""
         pass
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.to_dict = compile_asdict(cls)  # type: ignore[method-assign]
+
     def to_dict(self) -> dict[str, Any]:
         """Convert statement to dictionary using reflection."""
-        from .serialize import asdict
-
         return asdict(self)
 
 
@@ -92,6 +112,8 @@ class Stmt:
 
 
 class EmptyStmt(Stmt):
+    __slots__ = ()
+
     @classmethod
     def parse(cls, lexer: Lexer) -> EmptyStmt:
         lexer.consume("SEMICOLON")
@@ -107,6 +129,8 @@ class BreakStmt(Stmt):
 
     line: int
 
+    __slots__ = ("line",)
+
     def __init__(self, line: int = 0):
         self.line = line
 
@@ -117,11 +141,13 @@ class BreakStmt(Stmt):
 
     def codegen(self, info: FuncInfo):
         # Emit placeholder JMP and let enclosing loop patch it to loop end.
-        CodegenInst.jmp(info, 0)
+        _jmp(info, 0)
         info.emit_break_jmp()
 
 
 class ReturnStmt(Stmt):
+    __slots__ = ()
+
     @staticmethod
     def parse_list(lexer: Lexer) -> list[Expr]:
         lexer.consume("RETURN")
@@ -133,6 +159,8 @@ class ReturnStmt(Stmt):
 class FuncCallStmt(Stmt):
     func_call: FuncCallExpr
 
+    __slots__ = ("func_call",)
+
     def __init__(self, func_call: FuncCallExpr):
         self.func_call = func_call
 
@@ -151,13 +179,13 @@ class DoStmt(Stmt):
 
     block: Block
 
+    __slots__ = ("block",)
+
     def __init__(self, block: Block):
         self.block = block
 
     @classmethod
     def parse(cls, lexer: Lexer) -> DoStmt:
-        from .block import Block
-
         lexer.consume("DO")
         block = Block.parse(lexer)
         lexer.consume("END")
@@ -175,14 +203,14 @@ class WhileStmt(Stmt):
     exp: Expr
     block: Block
 
+    __slots__ = ("exp", "block")
+
     def __init__(self, exp: Expr, block: Block):
         self.exp = exp
         self.block = block
 
     @classmethod
     def parse(cls, lexer: Lexer) -> WhileStmt:
-        from .block import Block
-
         lexer.consume("WHILE")
         exp = Expr.parse(lexer)
         lexer.consume("DO")
@@ -191,19 +219,26 @@ class WhileStmt(Stmt):
         return cls(exp, block)
 
     def codegen(self, info: FuncInfo):
-        pc_start = info.current_pc()
+        # `while false do` never runs its body
+        if type(self.exp) is FalseExpr:
+            return
 
-        # Evaluate condition
-        cond_reg = info.alloc_reg()
-        self.exp.codegen(info, cond_reg)
+        pc_start = info.current_pc()
 
-        # Test condition: if true, skip JMP (continue loop); if false,
-        # execute JMP (exit loop)
-        CodegenInst.test(info, cond_reg, 1)
-        pc_jmp = info.current_pc()
-        # Placeholder jump to end if condition is false
-        CodegenInst.jmp(info, 0)
-        info.free_reg()
+        # `while true do` needs no condition test, only the back jump
+        pc_jmp = None
+        if type(self.exp) is not TrueExpr:
+            # Evaluate condition
+            cond_reg = info.alloc_reg()
+            self.exp.codegen(info, cond_reg)
+
+            # Test condition: if true, skip JMP (continue loop); if false,
+            # execute JMP (exit loop)
+            _test(info, cond_reg, 1)
+            pc_jmp = info.current_pc()
+            # Placeholder jump to end if condition is false
+            _jmp(info, 0)
+            info.free_reg()
 
         # Loop body
         info.enter_loop()
@@ -211,11 +246,12 @@ class WhileStmt(Stmt):
         self.block.codegen(info)
         info.exit_scope()
 
-        CodegenInst.jmp(info, pc_start - info.current_pc() - 1)
+        _jmp(info, pc_start - info.current_pc() - 1)
 
         # Patch the exit jump
         pc_end = info.current_pc()
-        info.insts[pc_jmp].set_sbx(pc_end - pc_jmp - 1)
+        if pc_jmp is not None:
+            info.patch_jmp(pc_jmp, pc_end)
         info.exit_loop(pc_end)
 
 
@@ -225,14 +261,14 @@ class RepeatStmt(Stmt):
     block: Block
     exp: Expr
 
+    __slots__ = ("block", "exp")
+
     def __init__(self, block: Block, exp: Expr):
         self.block = block
         self.exp = exp
 
     @classmethod
     def parse(cls, lexer: Lexer) -> RepeatStmt:
-        from .block import Block
-
         lexer.consume("REPEAT")
         block = Block.parse(lexer)
         lexer.consume("UNTIL")
@@ -254,8 +290,8 @@ class RepeatStmt(Stmt):
 
         # Test condition: if true, skip JMP (exit loop); if false,
         # execute JMP (repeat)
-        CodegenInst.test(info, cond_reg, 1)
-        CodegenInst.jmp(info, start_pc - info.current_pc() - 1)
+        _test(info, cond_reg, 1)
+        _jmp(info, start_pc - info.current_pc() - 1)
 
         info.free_reg()
         info.exit_loop(info.current_pc())
@@ -266,16 +302,18 @@ class IfStmt(Stmt):
 
     exps: list[Expr]
     blocks: list[Block]
+    else_idx: int | None  # index of the else clause, whose condition is never tested
 
-    def __init__(self, exps: list[Expr], blocks: list[Block]):
+    __slots__ = ("exps", "blocks", "else_idx")
+
+    def __init__(self, exps: list[Expr], blocks: list[Block], else_idx: int | None = None):
         self.exps = exps
         self.blocks = blocks
+        self.else_idx = else_idx
 
     @classmethod
     def parse(cls, lexer: Lexer) -> IfStmt:
         """Parse if-then-elseif-else-end statement."""
-        from .block import Block
-
         exps: list[Expr] = []
         blocks: list[Block] = []
 
@@ -285,56 +323,63 @@ class IfStmt(Stmt):
         blocks.append(Block.parse(lexer))
 
         # Handle elseif clauses
-        while lexer.current().type == "ELSEIF":
+        while lexer.current_type() == "ELSEIF":
             lexer.consume("ELSEIF")
             exps.append(Expr.parse(lexer))
             lexer.consume("THEN")
             blocks.append(Block.parse(lexer))
 
         # Handle else clause
-        if lexer.current().type == "ELSE":
+        else_idx = None
+        if lexer.current_type() == "ELSE":
             lexer.consume("ELSE")
+            else_idx = len(exps)
             exps.append(TrueExpr())  # Use TrueExp as condition for else
             blocks.append(Block.parse(lexer))
 
         lexer.consume("END")
-        return cls(exps, blocks)
+        return cls(exps, blocks, else_idx)
 
     def codegen(self, info: FuncInfo):
         jmp_to_ends: list[int] = []
 
-        for i in range(len(self.exps)):
-            # Evaluate condition (skip for else clause with TrueExpr)
-            if not isinstance(self.exps[i], TrueExpr):
+        for i, exp in enumerate(self.exps):
+            # The else clause and a literal `true` always run; later branches are dead
+            always = i == self.else_idx or type(exp) is TrueExpr
+            # A literal `false` (or nil) branch can never run
+            if not always and type(exp) in (FalseExpr, NilExpr):
+                continue
+
+            # Evaluate condition
+            if not always:
+                # The condition is dead once its TEST has run: free it before the block,
+                # so block locals (and the next condition) reuse the register
                 cond_reg = info.alloc_reg()
-                self.exps[i].codegen(info, cond_reg)
+                exp.codegen(info, cond_reg)
 
                 # Test condition: if true, skip JMP (execute this block);
                 # if false, execute JMP (try next branch)
-                CodegenInst.test(info, cond_reg, 1)
+                _test(info, cond_reg, 1)
                 pc_jmp_to_next = info.current_pc()
-                CodegenInst.jmp(info, 0)  # Placeholder jump to next branch
+                _jmp(info, 0)  # Placeholder jump to next branch
                 info.free_reg()
-            else:
-                pc_jmp_to_next = None
 
             # Execute block
             info.enter_scope()
             self.blocks[i].codegen(info)
             info.exit_scope()
 
+            if always:
+                break
+
             if i < len(self.exps) - 1:
                 jmp_to_ends.append(info.current_pc())
-                CodegenInst.jmp(info, 0)  # Placeholder
+                _jmp(info, 0)  # Placeholder
 
-            if pc_jmp_to_next is not None:
-                pc_next = info.current_pc()
-                info.insts[pc_jmp_to_next].set_sbx(pc_next - pc_jmp_to_next - 1)
+            info.patch_jmp(pc_jmp_to_next, info.current_pc())
 
         # Patch all jumps to end
-        pc_end = info.current_pc()
-        for jmp_pc in jmp_to_ends:
-            info.insts[jmp_pc].set_sbx(pc_end - jmp_pc - 1)
+        info.patch_jmps(jmp_to_ends, info.current_pc())
 
 
 # ============================================================================
@@ -343,13 +388,15 @@ class IfStmt(Stmt):
 
 
 class ForStmt(Stmt):
+    __slots__ = ()
+
     @classmethod
     def parse(cls, lexer: Lexer) -> ForNumStat | ForInStat:
         lexer.consume("FOR")
         varname = NameExpr.parse(lexer)
 
         # After parsing first variable, check what follows
-        if lexer.current().type == "ASSIGN":
+        if lexer.current_type() == "ASSIGN":
             return ForNumStat.parse_with_name(lexer, varname)
         else:  # COMMA or IN
             return ForInStat.parse_with_name(lexer, varname)
@@ -369,6 +416,8 @@ class ForNumStat(Stmt):
     step_expr: Expr | None
     block: Block
 
+    __slots__ = ("varname", "init_expr", "limit_expr", "step_expr", "block")
+
     def __init__(
         self,
         varname: NameExpr,
@@ -385,15 +434,13 @@ class ForNumStat(Stmt):
 
     @classmethod
     def parse_with_name(cls, lexer: Lexer, varname: NameExpr) -> ForNumStat:
-        from .block import Block
-
         lexer.consume("ASSIGN")
         init_expr = Expr.parse(lexer)
         lexer.consume("COMMA")
         limit_expr = Expr.parse(lexer)
 
         step_expr = None
-        if lexer.current().type == "COMMA":
+        if lexer.current_type() == "COMMA":
             lexer.consume("COMMA")
             step_expr = Expr.parse(lexer)
 
@@ -403,13 +450,25 @@ class ForNumStat(Stmt):
         return cls(varname, init_expr, limit_expr, step_expr, block)
 
     def codegen(self, info: FuncInfo):
+        # Literal bounds that fail the first FORLOOP test (`for i = 10, 1 do`) never run the body
+        init = _number_literal(self.init_expr)
+        limit = _number_literal(self.limit_expr)
+        step = 1 if self.step_expr is None else _number_literal(self.step_expr)
+        if (
+            init is not None
+            and limit is not None
+            and step is not None
+            and (init > limit if step > 0 else init < limit)
+        ):
+            return
+
         info.enter_scope()
         info.enter_loop()
 
         # Allocate registers for loop variables: index, limit, step
-        idx_reg = info.alloc_reg()
-        limit_reg = info.alloc_reg()
-        step_reg = info.alloc_reg()
+        idx_reg = info.alloc_regs(3)
+        limit_reg = idx_reg + 1
+        step_reg = idx_reg + 2
 
         # Initialize loop variables
         self.init_expr.codegen(info, idx_reg)
@@ -417,15 +476,16 @@ class ForNumStat(Stmt):
         if self.step_expr:
             self.step_expr.codegen(info, step_reg)
         else:
-            # Default step is 1
-            CodegenInst.load_k(info, step_reg, 1)
+            # Default step is 1. Lua 5.1 has no LOADI immediate, so this stays a
+            # LOADK; idx_of_const shares the pool entry across all loops.
+            _load_k(info, step_reg, 1)
 
         # Add loop variable to scope
         info.add_local_var(self.varname.name)
 
         # FORPREP instruction
         pc_forprep = info.current_pc()
-        CodegenInst.forprep(info, idx_reg, 0)  # Placeholder jump
+        _forprep(info, idx_reg, 0)  # Placeholder jump
 
         # Loop body
         self.block.codegen(info)
@@ -434,13 +494,23 @@ class ForNumStat(Stmt):
         pc_forloop = info.current_pc()
         offset = pc_forloop - pc_forprep
 
-        CodegenInst.forloop(info, idx_reg, -offset)
-        info.insts[pc_forprep].set_sbx(offset - 1)
+        _forloop(info, idx_reg, -offset)
+        info.patch_jmp(pc_forprep, pc_forloop)
 
         info.exit_loop(info.current_pc())
         info.exit_scope()
 
 
+def _number_literal(exp: Expr) -> int | float | None:
+    """Return the value of a (possibly negated) numeric literal, else None."""
+    if type(exp) is UnaryOpExpr and exp.op == "UNM":
+        value = _number_literal(exp.expr)
+        return None if value is None else -value
+    if type(exp) is IntegerExpr or type(exp) is FloatExpr:
+        return exp.value
+    return None
+
+
 class ForInStat(Stmt):
     """for vars in expr list do ... end"""
 
@@ -448,6 +518,8 @@ class ForInStat(Stmt):
     exprs: list[Expr]
     block: Block
 
+    __slots__ = ("var_names", "exprs", "block")
+
     def __init__(self, var_names: list[NameExpr], exps: list[Expr], block: Block):
         self.var_names = var_names
         self.exprs = exps
@@ -455,12 +527,7 @@ class ForInStat(Stmt):
 
     @classmethod
     def parse_with_name(cls, lexer: Lexer, first_var: NameExpr) -> ForInStat:
-        from .block import Block
-
-        var_names = [first_var]
-        while lexer.current().type == "COMMA":
-            lexer.consume()
-            var_names.append(NameExpr.parse(lexer))
+        var_names = parse_comma_list(lexer, NameExpr.parse, [first_var])
 
         lexer.consume("IN")
         exprs = Expr.parse_list(lexer)
@@ -477,11 +544,10 @@ class ForInStat(Stmt):
 
         reg = info.used_regs
 
-        iter_decl = LocalVarDeclStat(
-            [NameExpr("(for generator)"), NameExpr("(for state)"), NameExpr("(for control)")],
-            self.exprs,
+        exprs = self.exprs
+        _codegen_local_decl(
+            info, _FOR_IN_HIDDEN_NAMES, exprs, bool(exprs) and type(exprs[-1]) is FuncCallExpr
         )
-        iter_decl.codegen(info)
 
         # Add loop variables to scope
         for varname in self.var_names:
@@ -490,19 +556,19 @@ class ForInStat(Stmt):
         # info.alloc_reg() # func
 
         pc_jump = info.current_pc()
-        CodegenInst.jmp(info, 0)  # Placeholder
+        _jmp(info, 0)  # Placeholder
 
         # Loop body
         self.block.codegen(info)
 
         # TFORLOOP instruction
         pc_tforloop = info.current_pc()
-        CodegenInst.tforloop(info, reg, len(self.var_names))
+        _tforloop(info, reg, len(self.var_names))
 
-        CodegenInst.jmp(info, pc_jump - pc_tforloop - 1)
+        _jmp(info, pc_jump - pc_tforloop - 1)
 
         # Patch jump to end
-        info.insts[pc_jump].set_sbx(pc_tforloop - pc_jump - 1)
+        info.patch_jmp(pc_jump, pc_tforloop)
 
         # info.free_reg()
 
@@ -516,11 +582,13 @@ class ForInStat(Stmt):
 
 
 class LocalStmt(Stmt):
+    __slots__ = ()
+
     @classmethod
     def parse(cls, lexer: Lexer) -> LocalVarDeclStat | LocalFuncDefStat:
         lexer.consume("LOCAL")
 
-        if lexer.current().type == "FUNCTION":
+        if lexer.current_type() == "FUNCTION":
             return LocalFuncDefStat.parse(lexer)
         else:
             return LocalVarDeclStat.parse(lexer)
@@ -531,37 +599,61 @@ class LocalVarDeclStat(Stmt):
 
     var_names: list[NameExpr]
     exprs: list[Expr]
+    _tail_call: bool  # last expression is a call that can fill the remaining names
+
+    __slots__ = ("var_names", "exprs", "_tail_call")
 
     def __init__(self, var_names: list[NameExpr], exps: list[Expr]):
         self.var_names = var_names
         self.exprs = exps
+        self._tail_call = bool(exps) and type(exps[-1]) is FuncCallExpr
 
     @classmethod
     def parse(cls, lexer: Lexer) -> LocalVarDeclStat:
-        var_names = [NameExpr.parse(lexer)]
-        while lexer.current().type == "COMMA":
-            lexer.consume()
-            var_names.append(NameExpr.parse(lexer))
+        var_names = parse_comma_list(lexer, NameExpr.parse, [NameExpr.parse(lexer)])
 
         exps = []
-        if lexer.current().type == "ASSIGN":
+        if lexer.current_type() == "ASSIGN":
             lexer.consume()
             exps = Expr.parse_list(lexer)
 
         return cls(var_names, exps)
 
     def codegen(self, info: FuncInfo):
-        for i in range(len(self.var_names)):
-            var = info.add_local_var(self.var_names[i].name)
-            if i == len(self.exprs) - 1 and type(self.exprs[i]) is FuncCallExpr:
-                for j in range(i + 1, len(self.var_names)):
-                    info.add_local_var(self.var_names[j].name)
-                self.exprs[i].codegen(info, var.reg_idx, len(self.var_names) - i)
-                break
-            if i < len(self.exprs):
-                self.exprs[i].codegen(info, var.reg_idx)
-            else:
-                CodegenInst.load_nil(info, var.reg_idx, 1)
+        _codegen_local_decl(info, self.var_names, self.exprs, self._tail_call)
+
+
+def _codegen_local_decl(
+    info: FuncInfo, var_names: Sequence[NameExpr], exprs: list[Expr], tail_call: bool
+) -> None:
+    """Declare var_names as locals initialised from exprs (`local names = exprs`)."""
+    num_vars = len(var_names)
+    num_exprs = len(exprs)
+
+    # Names paired with a single-valued expression
+    num_single = min(num_vars, num_exprs - 1 if tail_call else num_exprs)
+    for i in range(num_single):
+        var = info.add_local_var(var_names[i].name)
+        exprs[i].codegen(info, var.reg_idx)
+    if num_single == num_vars:
+        return
+
+    # Remaining names occupy consecutive registers, filled by the tail call or one LOADNIL
+    first = info.add_local_var(var_names[num_single].name)
+    for i in range(num_single + 1, num_vars):
+        info.add_local_var(var_names[i].name)
+    if num_single < num_exprs:
+        exprs[num_single].codegen(info, first.reg_idx, num_vars - num_single)
+    else:
+        _load_nil(info, first.reg_idx, num_vars - num_single)
+
+
+# Hidden locals holding the generic-for iterator triple
+_FOR_IN_HIDDEN_NAMES = (
+    NameExpr("(for generator)"),
+    NameExpr("(for state)"),
+    NameExpr("(for control)"),
+)
 
 
 class AssignStmt(Stmt):
@@ -570,16 +662,15 @@ class AssignStmt(Stmt):
     var_list: list[Expr]
     expr_list: list[Expr]
 
+    __slots__ = ("var_list", "expr_list")
+
     def __init__(self, varlist: list[Expr], expr_list: list[Expr]):
         self.var_list = varlist
         self.expr_list = expr_list
 
     @classmethod
     def parse_with_first(cls, lexer: Lexer, first_var: Expr) -> AssignStmt:
-        varlist = [first_var]
-        while lexer.current().type == "COMMA":
-            lexer.consume()
-            varlist.append(Expr.parse(lexer))
+        varlist = parse_comma_list(lexer, Expr.parse, [first_var])
 
         lexer.consume("ASSIGN")
         expr_list = Expr.parse_list(lexer)
@@ -592,12 +683,12 @@ class AssignStmt(Stmt):
         lexer.consume("FUNCTION")
         exp: Expr = NameExpr.parse(lexer)
 
-        while lexer.current().type == "DOT":
+        while lexer.current_type() == "DOT":
             exp = TableAccessExpr.parse_dot(lexer, exp)
 
         # Handle obj:method (inserts 'self' as first parameter)
         colon = False
-        if lexer.current().type == "COLON":
+        if lexer.current_type() == "COLON":
             exp = TableAccessExpr.parse_colon(lexer, exp)
             colon = True
 
@@ -607,47 +698,52 @@ class AssignStmt(Stmt):
         num_exprs = len(self.expr_list)
         num_vars = len(self.var_list)
 
-        exp_regs: list[int] = []
-        for i, expr in enumerate(self.expr_list):
-            reg = info.alloc_reg()
-            if i == num_exprs - 1 and isinstance(expr, FuncCallExpr):
-                # Lua expands only the last function call in assignment context.
-                want = max(1, num_vars - i)
-                for _ in range(want - 1):
-                    info.alloc_reg()
-                expr.codegen(info, reg, want)
-                exp_regs.extend(range(reg, reg + want))
-            else:
-                expr.codegen(info, reg)
-                exp_regs.append(reg)
-
-        for i in range(num_vars):
-            var = self.var_list[i]
-            if i < len(exp_regs):
-                val_reg = exp_regs[i]
-            else:
-                val_reg = info.alloc_reg()
-                CodegenInst.load_nil(info, val_reg, 1)
-                exp_regs.append(val_reg)
-
-            if isinstance(var, NameExpr):
+        # `local = exp`: evaluate straight into the local's register, no scratch or MOVE
+        if num_vars == 1 and num_exprs == 1:
+            var = self.var_list[0]
+            exp = self.expr_list[0]
+            if type(var) is NameExpr and type(exp) in _DIRECT_STORE_EXPRS:
                 local = info.get_local_var(var.name)
                 if local:
-                    CodegenInst.move(info, local.reg_idx, val_reg)
+                    exp.codegen(info, local.reg_idx)
+                    return
+
+        # Lua expands only the last function call in assignment context.
+        last_expr = self.expr_list[-1]
+        want = max(1, num_vars - num_exprs + 1) if isinstance(last_expr, FuncCallExpr) else 1
+        num_vals = num_exprs - 1 + want
+        num_regs = max(num_vals, num_vars)
+        base = info.alloc_regs(num_regs)
+
+        for i in range(num_exprs - 1):
+            self.expr_list[i].codegen(info, base + i)
+        if want > 1:
+            last_expr.codegen(info, base + num_exprs - 1, want)
+        else:
+            last_expr.codegen(info, base + num_exprs - 1)
+        if num_vars > num_vals:
+            _load_nil(info, base + num_vals, num_vars - num_vals)
+
+        # Each target is resolved exactly once, in order, so the constant table
+        # layout matches the order names and keys appear in the statement
+        val_reg = base
+        for var in self.var_list:
+            if type(var) is NameExpr:
+                name = var.name
+                local = info.get_local_var(name)
+                if local:
+                    _move(info, local.reg_idx, val_reg)
+                elif (upval_idx := info.idx_of_upval(name)) is not None:
+                    _set_upval(info, val_reg, upval_idx)
                 else:
-                    upval_idx = info.idx_of_upval(var.name)
-                    if upval_idx is not None:
-                        CodegenInst.set_upval(info, val_reg, upval_idx)
-                    else:
-                        idx = info.idx_of_const(var.name)
-                        CodegenInst.set_global(info, val_reg, idx)
-            elif isinstance(var, TableAccessExpr):
+                    _set_global(info, val_reg, info.idx_of_const(name))
+            elif type(var) is TableAccessExpr:
                 var.codegen_set(info, val_reg)
             else:
                 raise NotImplementedError(f"Assignment to {type(var).__name__} not implemented.")
+            val_reg += 1
 
-        for _ in exp_regs:
-            info.free_reg()
+        info.free_regs(num_regs)
 
 
 class LocalFuncDefStat(Stmt):
@@ -656,6 +752,8 @@ class LocalFuncDefStat(Stmt):
     name: NameExpr
     body: FuncDefExpr
 
+    __slots__ = ("name", "body")
+
     def __init__(self, name: NameExpr, body: FuncDefExpr):
         self.name = name
         self.body = body
@@ -670,3 +768,22 @@ class LocalFuncDefStat(Stmt):
     def codegen(self, info: FuncInfo):
         local = info.add_local_var(self.name.name)
         self.body.codegen(info, local.reg_idx)
+
+
+def _set_block_cls(cls: type[Block]) -> None:
+    """Bind Block once parser.block has loaded, breaking the import cycle."""
+    global Block
+    Block = cls  # type: ignore[misc]
+
+
+Stmt._DISPATCH = {
+    "SEMICOLON": EmptyStmt.parse,
+    "BREAK": BreakStmt.parse,
+    "DO": DoStmt.parse,
+    "WHILE": WhileStmt.parse,
+    "REPEAT": RepeatStmt.parse,
+    "IF": IfStmt.parse,
+    "FOR": ForStmt.parse,
+    "FUNCTION": AssignStmt.parse_func,
+    "LOCAL": LocalStmt.parse,
+}
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from io import StringIO
 from typing import TYPE_CHECKING
 
 from structs.instruction import Instruction
@@ -17,6 +18,13 @@ class LocalVar:
     start_pc: int
     end_pc: int
 
+    __slots__ = ("name", "start_pc", "end_pc")
+
+    def __init__(self, name: str = "", start_pc: int = 0, end_pc: int = 0):
+        self.name = name
+        self.start_pc = start_pc
+        self.end_pc = end_pc
+
     def __str__(self) -> str:
         return f"{self.name}\t{self.start_pc + 1}\t{self.end_pc + 1}"
 
@@ -26,25 +34,33 @@ class Debug:
     loc_vars: list[LocalVar]
     upvalues: list[str]
 
+    __slots__ = ("line_infos", "loc_vars", "upvalues")
+
     def __init__(self):
         self.line_infos = []
         self.loc_vars = []
         self.upvalues = []
 
     def __str__(self) -> str:
-        parts: list[str] = []
-        parts.append(f"locals ({len(self.loc_vars)}):")
-        parts.extend(f"\t{i}\t{value}" for i, value in enumerate(self.loc_vars))
+        buf = StringIO()
+        self.write_listing(buf)
+        return buf.getvalue()
 
-        parts.append(f"upvalues ({len(self.upvalues)}):")
-        parts.extend(f"\t{i}\t{value}" for i, value in enumerate(self.upvalues))
+    def write_listing(self, buf: StringIO) -> None:
+        """Write the locals/upvalues listing into buf."""
+        write = buf.write
+        write(f"locals ({len(self.loc_vars)}):")
+        for i, value in enumerate(self.loc_vars):
+            write(f"\n\t{i}\t{value}")
 
-        return "\n".join(parts)
+        write(f"\nupvalues ({len(self.upvalues)}):")
+        for i, name in enumerate(self.upvalues):
+            write(f"\n\t{i}\t{name}")
 
 
 class Proto:
     source: str
-    type: str = "main"
+    type: str
     line_defined: int
     last_line_defined: int
     num_upvalues: int
@@ -55,9 +71,27 @@ class Proto:
     consts: list[Value]
     protos: list[Proto]
     debug: Debug
+    nil_frame: list[Value]  # max_stack_size nils, set with it; copied as each call's stack
+
+    __slots__ = (
+        "source",
+        "type",
+        "line_defined",
+        "last_line_defined",
+        "num_upvalues",
+        "num_params",
+        "is_vararg",
+        "max_stack_size",
+        "codes",
+        "consts",
+        "protos",
+        "debug",
+        "nil_frame",
+    )
 
     def __init__(self) -> None:
         self.source = ""
+        self.type = "main"
         self.line_defined = 0
         self.last_line_defined = 0
         self.num_upvalues = 0
@@ -68,29 +102,44 @@ class Proto:
         self.consts = []
         self.protos = []
         self.debug = Debug()
+        self.nil_frame = []
 
     def __str__(self) -> str:
-        parts: list[str] = []
-        parts.append(
-            f"{self.type} <{self.source}:{self.line_defined},{self.last_line_defined}> ({len(self.codes)} instructions)"
+        buf = StringIO()
+        self.write_listing(buf)
+        return buf.getvalue()
+
+    def write_listing(self, buf: StringIO) -> None:
+        """Write this proto's listing, then its sub-protos', into one shared buffer."""
+        write = buf.write
+        write(
+            f"\n{self.type} <{self.source}:{self.line_defined},{self.last_line_defined}> ({len(self.codes)} instructions)"
         )
-        parts.append(
-            f"{self.num_params} params, {self.max_stack_size} slots, {len(self.debug.upvalues)} upvalues, \
+        write(
+            f"\n{self.num_params} params, {self.max_stack_size} slots, {len(self.debug.upvalues)} upvalues, \
                      {len(self.debug.loc_vars)} locals, {len(self.consts)} constants, {len(self.protos)} functions"
         )
-        parts.extend(f"\t{pc + 1}\t{code}" for pc, code in enumerate(self.codes))
-        parts.append(f"constants ({len(self.consts)}):")
-        parts.extend(f"\t{i + 1}\t{value}" for i, value in enumerate(self.consts))
-        parts.append(str(self.debug))
-        parts.extend(str(sub) for sub in self.protos)
-
-        return "\n" + "\n".join(parts)
+        consts = self.consts
+        upvalues = self.debug.upvalues
+        for pc, code in enumerate(self.codes):
+            code.ensure_info(pc, consts, upvalues)
+            write(f"\n\t{pc + 1}\t{code}")
+        write(f"\nconstants ({len(consts)}):")
+        for i, value in enumerate(consts):
+            write(f"\n\t{i + 1}\t{value}")
+        write("\n")
+        self.debug.write_listing(buf)
+        for sub in self.protos:
+            write("\n")
+            sub.write_listing(buf)
 
 
 class Closure:
     stack: list[Value]
     upvalues: list[Value]
 
+    __slots__ = ("stack", "upvalues")
+
 
 class LClosure(Closure):
     varargs: list[Value]
@@ -99,10 +148,12 @@ class LClosure(Closure):
     ret_idx: int
     pc: int
 
+    __slots__ = ("varargs", "func", "num_rets", "ret_idx", "pc")
+
     def __init__(self, func: Proto):
         from structs.value import Value
 
-        self.stack = [Value.nil()] * func.max_stack_size
+        self.stack = func.nil_frame.copy()
         self.upvalues = [Value.nil()] * func.num_upvalues
         # Initialize upvalues based on function prototype
         self.varargs = []
@@ -129,6 +180,8 @@ class LClosure(Closure):
 class PClosure(Closure):
     func: PyFunction
 
+    __slots__ = ("func",)
+
     def __init__(self, func: PyFunction):
         self.func = func
         self.stack = []
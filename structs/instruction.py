@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from codegen.inst import OPCODES, OpArgK, OpArgN, OpCode, OpMode
 
 if TYPE_CHECKING:
     from structs.value import Value
+    from vm.state import LuaState
 
 
 def a_to_bitset(a: int) -> int:
@@ -52,19 +54,50 @@ def bitset_to_asbx(instruction: int) -> tuple[int, int]:
     return a, sbx
 
 
+def _unbound_handler(inst: Instruction, state: LuaState):
+    raise RuntimeError(f"no handler bound for {inst.op_name()}")
+
+
 class Instruction:
     _opcode_idx: int
     _opcode: OpCode
-    _a: int
-    _b: int | None
-    _c: int | None
-    _bx: int | None
-    _sbx: int | None
-    _args: list[int]
-    _comment: list[str]
+    _name: str  # cached from _opcode for the dispatch loop
+    _mode: int  # cached from _opcode for operand access
+    # Decoded operands, read directly by the VM handlers
+    a: int
+    b: int
+    c: int
+    bx: int
+    sbx: int
+    _bits: int  # the encoded 32-bit word; operands above are decoded from it once
+    _args: tuple[int, ...] | None  # listing operands, built by update_info
+    _comment: tuple[str, ...] | None
+    handler: Callable[[Instruction, LuaState], None]  # bound by the VM before running
+    # Constants named by RK operands b/c, bound with the handler; None for registers.
+    # Values are always truthy, so handlers read `inst.kb or stack[inst.b]`.
+    kb: Value | None
+    kc: Value | None
 
     bias = 131071  # 2^18 - 1
 
+    __slots__ = (
+        "_opcode_idx",
+        "_opcode",
+        "_name",
+        "_mode",
+        "a",
+        "b",
+        "c",
+        "bx",
+        "sbx",
+        "_bits",
+        "_args",
+        "_comment",
+        "handler",
+        "kb",
+        "kc",
+    )
+
     def __init__(
         self,
         instruction: int | None = None,
@@ -75,34 +108,46 @@ class Instruction:
         bx: int | None = None,
         sbx: int | None = None,
     ):
-        self._args = []
-        self._comment = []
+        self._args = self._comment = None
+        self.handler = _unbound_handler
+        self.kb = self.kc = None
+        # Operands outside the opcode's format stay 0 so encoding needs no None checks
+        self.b = self.c = self.bx = self.sbx = 0
 
         if instruction is not None:
+            self._bits = instruction
+            # Field extraction inlined from bitset_to_abc/abx/asbx: this runs once per loaded word
             self._opcode_idx = instruction & 0x3F
-            self._opcode = OPCODES[self._opcode_idx]
-            if self._opcode.mode == OpMode.iABC:
-                self._a, self._b, self._c = bitset_to_abc(instruction)
-            elif self._opcode.mode == OpMode.iABx:
-                self._a, self._bx = bitset_to_abx(instruction)
-            elif self._opcode.mode == OpMode.iAsBx:
-                self._a, self._sbx = bitset_to_asbx(instruction)
+            self._opcode = opcode = OPCODES[self._opcode_idx]
+            self._name = opcode.name
+            self._mode = mode = opcode.mode
+            self.a = (instruction >> 6) & 0xFF
+            if mode == OpMode.iABC:
+                self.b = (instruction >> 23) & 0x1FF
+                self.c = (instruction >> 14) & 0x1FF
+            elif mode == OpMode.iABx:
+                self.bx = (instruction >> 14) & 0x3FFFF
+            elif mode == OpMode.iAsBx:
+                self.sbx = ((instruction >> 14) & 0x3FFFF) - Instruction.bias
         else:
             assert code_idx is not None and a is not None, (
                 "Must provide code_idx and a when instruction is None"
             )
             self._opcode_idx = code_idx
-            self._opcode = OPCODES[self._opcode_idx]
+            self._opcode = opcode = OPCODES[self._opcode_idx]
+            self._name = opcode.name
+            self._mode = opcode.mode
             if b is not None and c is not None:
-                self._a = a
-                self._b = b
-                self._c = c
+                self.a = a
+                self.b = b
+                self.c = c
             elif bx is not None:
-                self._a = a
-                self._bx = bx
+                self.a = a
+                self.bx = bx
             elif sbx is not None:
-                self._a = a
-                self._sbx = sbx
+                self.a = a
+                self.sbx = sbx
+            self._bits = _ENCODERS[self._mode](self)
 
     @classmethod
     def from_abc(cls, opcode_idx: int, a: int, b: int, c: int) -> Instruction:
@@ -117,90 +162,150 @@ class Instruction:
         return cls(code_idx=opcode_idx, a=a, sbx=sbx)
 
     def op_name(self) -> str:
-        return self._opcode.name
+        return self._name
+
+    def op_idx(self) -> int:
+        return self._opcode_idx
 
     def abc(self) -> tuple[int, int, int]:
         """Return A, B, C arguments, with None as default for missing values."""
-        assert type(self._b) is int and type(self._c) is int, "Instruction is not in ABC format"
-        return self._a, self._b, self._c
+        assert self._mode == OpMode.iABC, "Instruction is not in ABC format"
+        return self.a, self.b, self.c
 
     def abx(self) -> tuple[int, int]:
-        assert type(self._bx) is int, "Instruction is not in ABx format"
-        return self._a, self._bx
+        assert self._mode == OpMode.iABx, "Instruction is not in ABx format"
+        return self.a, self.bx
 
     def asbx(self) -> tuple[int, int]:
-        assert type(self._sbx) is int, "Instruction is not in ABx format"
-        return self._a, self._sbx
-
-    def set_sbx(self, sbx: int) -> None:
-        assert self._opcode.mode == OpMode.iAsBx, "Instruction is not in ABx format"
-        self._sbx = sbx
-
-    def _append_arg(self, arg_type: int, value: int, constants: list[Value]):
-        """Get argument representation based on its type."""
-        if arg_type != OpArgN:
-            if arg_type == OpArgK and value > 255:
-                self._comment.append(str(constants[value - 256]))
-                value = 255 - value
-            self._args.append(value)
+        assert self._mode == OpMode.iAsBx, "Instruction is not in AsBx format"
+        return self.a, self.sbx
 
     def update_info(self, pc: int, constants: list[Value], upvalues: list[str]):
-        """Update instruction arguments with constant/upvalue info."""
-        self._args.append(self._a)
-
-        if self._opcode.mode == OpMode.iABC:
-            assert type(self._b) is int and type(self._c) is int, "Instruction is not in ABC format"
-            self._append_arg(self._opcode.argb, self._b, constants)
-            self._append_arg(self._opcode.argc, self._c, constants)
-        elif self._opcode.mode == OpMode.iABx:
-            assert type(self._bx) is int, "Instruction is not in ABx format"
-            if self._opcode.name in ["LOADK", "GETGLOBAL", "SETGLOBAL"]:
-                self._comment.append(str(constants[self._bx]))
-                self._args.append(-(self._bx + 1))
-            else:
-                self._args.append(self._bx)
-        elif self._opcode.mode == OpMode.iAsBx:
-            assert type(self._sbx) is int, "Instruction is not in ABx format"
-            self._args.append(self._sbx)
-            self._comment.append(f"to {self._sbx + pc + 2}")
-
-        # Special handling for specific opcodes
-        if self._opcode.name in ["GETUPVAL", "SETUPVAL"] and self._args[1] < len(upvalues):
-            self._comment.append(upvalues[self._args[1]])
+        """Build the listing operands, resolving constant/upvalue names."""
+        _INFO_UPDATERS[self._opcode_idx](self, pc, constants, upvalues)
+
+    def ensure_info(self, pc: int, constants: list[Value], upvalues: list[str]):
+        """Build the listing operands on first use; they are fixed for the owning proto."""
+        if self._args is None:
+            _INFO_UPDATERS[self._opcode_idx](self, pc, constants, upvalues)
 
     def to_bitset(self) -> int:
-        """Convert instruction back to its 32-bit integer representation."""
-        if self._opcode.mode == OpMode.iABC:
-            return (
-                (self._opcode_idx & 0x3F)
-                | a_to_bitset(self._a)
-                | b_to_bitset(self._b or 0)
-                | c_to_bitset(self._c or 0)
-            )
-        elif self._opcode.mode == OpMode.iABx:
-            return (self._opcode_idx & 0x3F) | a_to_bitset(self._a) | bx_to_bitset(self._bx or 0)
-        elif self._opcode.mode == OpMode.iAsBx:
-            return (self._opcode_idx & 0x3F) | a_to_bitset(self._a) | sbx_to_bitset(self._sbx or 0)
-        else:
-            raise ValueError("Invalid opcode mode")
+        """Return the instruction's 32-bit integer representation."""
+        return self._bits
 
     def __str__(self) -> str:
-        parts = [self._opcode.name.ljust(10)]
+        parts = [_LISTING_NAMES[self._opcode_idx]]
         if self._args:
             parts.append(" ".join(str(arg) for arg in self._args))
             if self._comment:
                 parts.append(f"; {' '.join(self._comment)}")
         else:
-            parts.append(f"a = {self._a}")
-            if self._opcode.mode == OpMode.iABC:
-                parts.append(f"b = {self._b}")
-                parts.append(f"c = {self._c}")
-            elif self._opcode.mode == OpMode.iABx:
-                parts.append(f"bx = {self._bx}")
-            elif self._opcode.mode == OpMode.iAsBx:
-                parts.append(f"sbx = {self._sbx}")
+            parts.append(_RAW_OPERANDS[self._mode](self))
 
         return "\t".join(parts)
 
     def __repr__(self):
-        return f"<Instruction {self._opcode.name} 0x{self.to_bitset():08X}>"
+        return f"<Instruction {self._name} 0x{self.to_bitset():08X}>"
+
+
+# Encoders inline the *_to_bitset shifts: one frame per word instead of four.
+# _opcode_idx always indexes OPCODES, so it needs no mask.
+
+
+def _encode_abc(inst: Instruction) -> int:
+    return (
+        inst._opcode_idx
+        | ((inst.a & 0xFF) << 6)
+        | ((inst.b & 0x1FF) << 23)
+        | ((inst.c & 0x1FF) << 14)
+    )
+
+
+def _encode_abx(inst: Instruction) -> int:
+    return inst._opcode_idx | ((inst.a & 0xFF) << 6) | ((inst.bx & 0x3FFFF) << 14)
+
+
+def _encode_asbx(inst: Instruction) -> int:
+    return (
+        inst._opcode_idx
+        | ((inst.a & 0xFF) << 6)
+        | (((inst.sbx + Instruction.bias) & 0x3FFFF) << 14)
+    )
+
+
+# Word encoders indexed by OpMode
+_ENCODERS = (_encode_abc, _encode_abx, _encode_asbx)
+
+
+def _raw_abc(inst: Instruction) -> str:
+    return f"a = {inst.a}\tb = {inst.b}\tc = {inst.c}"
+
+
+def _raw_abx(inst: Instruction) -> str:
+    return f"a = {inst.a}\tbx = {inst.bx}"
+
+
+def _raw_asbx(inst: Instruction) -> str:
+    return f"a = {inst.a}\tsbx = {inst.sbx}"
+
+
+# Operand formatters for instructions without listing info, indexed by OpMode
+_RAW_OPERANDS = (_raw_abc, _raw_abx, _raw_asbx)
+
+
+def _rk_arg_source(field: str) -> str:
+    """Source appending an RK operand, annotating it when it names a constant."""
+    return (
+        f"    v = self.{field}\n"
+        "    if v > 255:\n"
+        "        comment.append(str(constants[v - 256]))\n"
+        "        v = 255 - v\n"
+        "    args.append(v)\n"
+    )
+
+
+def _compile_info_updater(
+    opcode: OpCode,
+) -> Callable[[Instruction, int, list[Value], list[str]], None]:
+    """Build a straight-line update_info body for one opcode.
+
+    The operand modes and name-based special cases are resolved here, once per
+    opcode, instead of on every call.
+    """
+    lines = [
+        "    args = [self.a]\n",
+        "    comment = []\n",
+    ]
+    if opcode.mode == OpMode.iABC:
+        for arg_type, field in ((opcode.argb, "b"), (opcode.argc, "c")):
+            if arg_type == OpArgK:
+                lines.append(_rk_arg_source(field))
+            elif arg_type != OpArgN:
+                lines.append(f"    args.append(self.{field})\n")
+    elif opcode.mode == OpMode.iABx:
+        if opcode.name in ("LOADK", "GETGLOBAL", "SETGLOBAL"):
+            lines.append("    comment.append(str(constants[self.bx]))\n")
+            lines.append("    args.append(-(self.bx + 1))\n")
+        else:
+            lines.append("    args.append(self.bx)\n")
+    elif opcode.mode == OpMode.iAsBx:
+        lines.append("    args.append(self.sbx)\n")
+        lines.append("    comment.append(f'to {self.sbx + pc + 2}')\n")
+
+    if opcode.name in ("GETUPVAL", "SETUPVAL"):
+        lines.append("    if args[1] < len(upvalues):\n")
+        lines.append("        comment.append(upvalues[args[1]])\n")
+
+    lines.append("    self._args = tuple(args)\n")
+    lines.append("    self._comment = tuple(comment)\n")
+    source = "def update_info(self, pc, constants, upvalues):\n" + "".join(lines)
+    namespace: dict[str, Any] = {}
+    exec(compile(source, f"<update_info {opcode.name}>", "exec"), namespace)
+    return namespace["update_info"]
+
+
+# Opcode names padded for the listing column, indexed by opcode number
+_LISTING_NAMES = [opcode.name.ljust(10) for opcode in OPCODES]
+
+# Per-opcode update_info bodies, indexed by opcode number
+_INFO_UPDATERS = [_compile_info_updater(opcode) for opcode in OPCODES]
@@ -21,16 +21,25 @@ def _make_number_value(v: int | float) -> Value:
 
 
 class Table:
-    _metatable: Table | None = None
+    _metatable: Table | None
     _list: list[Value]
     _map: dict[Value | int, Value]
 
+    __slots__ = ("_metatable", "_list", "_map")
+
     def __init__(self):
+        self._metatable = None
         self._list = []
         self._map = {}
 
     def get(self, key: int | Value) -> Value | None:
-        int_key = key if isinstance(key, int) else key.get_integer()
+        if isinstance(key, int):
+            int_key: int | None = key
+        elif type(key.value) is str:
+            # String keys (field names, metamethod names) only live in the hash part
+            return self._map.get(key, None)
+        else:
+            int_key = key.get_integer()
         if int_key is not None:
             if 1 <= int_key <= len(self._list):
                 return self._list[int_key - 1]
@@ -59,6 +68,19 @@ class Table:
             else:
                 self._map[key] = value
 
+    def set_list(self, start: int, values: list[Value]):
+        """Store values at keys start, start + 1, ...; used by SETLIST."""
+        if start == len(self._list) + 1 and all(value.value is not None for value in values):
+            # Appending to the array part: one extend instead of a set() per item
+            if self._map:
+                for key in range(start, start + len(values)):
+                    self._map.pop(key, None)
+            self._list.extend(values)
+            self._expand_list()
+        else:
+            for i, value in enumerate(values):
+                self.set(start + i, value)
+
     def len(self) -> int:
         return len(self._list)
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from enum import Enum
+from typing import ClassVar
 
 from structs.function import Closure, LClosure, PClosure
 from structs.table import Table
@@ -21,50 +23,114 @@ class LuaType(Enum):
     THREAD = 8
 
 
-# Sentinel for uninitialized singleton cache
+# Sentinel for cache misses where None is a valid cached result
 _UNSET = object()
 
+# Value.tag numbers, as in LuaType, plus one past the end for foreign values
+TAG_UNKNOWN = len(LuaType)
+TAG_NIL = LuaType.NIL.value
+TAG_BOOLEAN = LuaType.BOOLEAN.value
+TAG_NUMBER = LuaType.NUMBER.value
+TAG_STRING = LuaType.STRING.value
+TAG_TABLE = LuaType.TABLE.value
+TAG_FUNCTION = LuaType.FUNCTION.value
+
+_TAG_MAP: dict[type, int] = {
+    type(None): TAG_NIL,
+    bool: TAG_BOOLEAN,
+    int: TAG_NUMBER,
+    float: TAG_NUMBER,
+    str: TAG_STRING,
+    Table: TAG_TABLE,
+    LClosure: TAG_FUNCTION,
+    PClosure: TAG_FUNCTION,
+}
+
+# type() names indexed by tag
+_TYPE_NAMES = tuple(lua_type.name.lower() for lua_type in LuaType) + ("unknown",)
+
+
+def _format_nil(value: LuaValue) -> str:
+    return "nil"
+
+
+def _format_boolean(value: LuaValue) -> str:
+    return "true" if value else "false"
+
+
+# Per-tag formatters for __str__/__repr__; numbers and unknown values use str()
+_STR_FORMATTERS: dict[int, Callable[[LuaValue], str]] = {
+    TAG_NIL: _format_nil,
+    TAG_BOOLEAN: _format_boolean,
+    TAG_TABLE: lambda value: "table: " + hex(id(value)),
+    TAG_FUNCTION: lambda value: "function: " + hex(id(value)),
+}
+
+_REPR_FORMATTERS: dict[int, Callable[[LuaValue], str]] = {
+    TAG_NIL: _format_nil,
+    TAG_BOOLEAN: _format_boolean,
+    TAG_STRING: lambda value: f'"{value}"',
+    TAG_TABLE: lambda value: "table",
+    TAG_FUNCTION: lambda value: "function",
+}
+
 
 class Value:
     value: LuaValue
+    tag: int  # LuaType number of value, resolved once from its Python type
+
+    __slots__ = ("value", "tag")
 
     # Singleton caches for frequently created immutable values
-    _NIL: Value | None = None
-    _TRUE: Value | None = None
-    _FALSE: Value | None = None
+    _NIL: ClassVar[Value]
+    _TRUE: ClassVar[Value]
+    _FALSE: ClassVar[Value]
+
+    # Intern caches for small integers and short/identifier-like strings.
+    # Values are never mutated in place, so sharing them is safe.
+    _INT_CACHE: dict[int, Value] = {}
+    _STR_CACHE: dict[str, Value] = {}
+    _STR_CACHE_MAX = 4096
+    # Parsed results of string-to-number coercion (None when not numeric)
+    _STR_NUM_CACHE: dict[str, Value | None] = {}
 
     def __init__(self, value: LuaValue):
         self.value = value
-        self._conv_float_to_int()
+        self.tag = _TAG_MAP.get(type(value), TAG_UNKNOWN)
 
     @classmethod
     def nil(cls) -> Value:
         """Create a nil value (cached singleton)"""
-        if cls._NIL is None:
-            cls._NIL = cls(None)
         return cls._NIL
 
     @classmethod
     def boolean(cls, val: bool) -> Value:
         """Create a boolean value (cached singletons for True/False)"""
-        if val:
-            if cls._TRUE is None:
-                cls._TRUE = cls(True)
-            return cls._TRUE
-        else:
-            if cls._FALSE is None:
-                cls._FALSE = cls(False)
-            return cls._FALSE
+        return cls._TRUE if val else cls._FALSE
 
     @classmethod
     def number(cls, val: int | float) -> Value:
-        """Create a number value"""
+        """Create a number value (integral floats are stored as int)"""
+        if isinstance(val, float):
+            if not val.is_integer():
+                return cls(val)
+            val = int(val)
+        cached = cls._INT_CACHE.get(val)
+        if cached is not None:
+            return cached
         return cls(val)
 
     @classmethod
     def string(cls, val: str) -> Value:
-        """Create a string value"""
-        return cls(val)
+        """Create a string value (short and identifier-like strings are interned)"""
+        cache = cls._STR_CACHE
+        cached = cache.get(val)
+        if cached is not None:
+            return cached
+        value = cls(val)
+        if (len(val) <= 1 or val.isidentifier()) and len(cache) < cls._STR_CACHE_MAX:
+            cache[val] = value
+        return value
 
     @classmethod
     def table(cls, val: Table) -> Value:
@@ -84,91 +150,60 @@ class Value:
 
     def to_str_number(self) -> Value | None:
         """Return a new Value with string converted to number, or None if not convertible."""
-        if self.is_string():
-            assert isinstance(self.value, str)
-            try:
-                num = float(self.value)
-                if num.is_integer():
-                    return Value.number(int(num))
-                return Value.number(num)
-            except (ValueError, OverflowError):
-                return None
         if self.is_number():
             return self
-        return None
-
-    # Keep backward-compatible in-place methods (used by CheckNumber)
-    def conv_number_to_str(self):
-        if self.is_number():
-            self.value = str(self.value)
-
-    def conv_str_to_number(self) -> bool:
-        """Try to convert string value to number in-place. Returns True on success."""
-        if self.is_number():
-            return True
         if self.is_string():
             assert isinstance(self.value, str)
+            cache = Value._STR_NUM_CACHE
+            cached = cache.get(self.value, _UNSET)
+            if cached is not _UNSET:
+                return cached  # type: ignore[return-value]
             try:
-                self.value = float(self.value)
-                self._conv_float_to_int()
-                return True
+                num: Value | None = Value.number(float(self.value))
             except (ValueError, OverflowError):
-                return False
-        return False
-
-    def _conv_float_to_int(self):
-        if isinstance(self.value, float) and self.value.is_integer():
-            self.value = int(self.value)
+                num = None
+            if len(cache) < Value._STR_CACHE_MAX:
+                cache[self.value] = num
+            return num
+        return None
 
     def is_nil(self) -> bool:
-        return self.value is None
+        return self.tag == TAG_NIL
 
     def is_boolean(self) -> bool:
-        return type(self.value) is bool
+        return self.tag == TAG_BOOLEAN
 
     def is_number(self) -> bool:
-        return isinstance(self.value, (int, float)) and not isinstance(self.value, bool)
+        return self.tag == TAG_NUMBER
 
     def is_string(self) -> bool:
-        return isinstance(self.value, str)
+        return self.tag == TAG_STRING
 
     def is_table(self) -> bool:
-        return isinstance(self.value, Table)
+        return self.tag == TAG_TABLE
 
     def is_function(self) -> bool:
-        return isinstance(self.value, (LClosure, PClosure))
+        return self.tag == TAG_FUNCTION
 
     def is_userdata(self) -> bool:
         return False  # Placeholder for userdata type
 
     def type_name(self) -> str:
-        if self.is_nil():
-            return "nil"
-        elif self.is_boolean():
-            return "boolean"
-        elif self.is_number():
-            return "number"
-        elif self.is_string():
-            return "string"
-        elif self.is_table():
-            return "table"
-        elif self.is_function():
-            return "function"
-        return "unknown"
+        return _TYPE_NAMES[self.tag]
 
     def get_boolean(self) -> bool:
-        if self.is_nil():
-            return False
-        if self.is_boolean():
-            assert type(self.value) is bool
-            return self.value
-        return True
+        # Only nil and false are falsy; both payloads are singletons
+        value = self.value
+        return value is not None and value is not False
 
     def get_integer(self) -> int | None:
-        if type(self.value) is int:
-            return self.value
-        if type(self.value) is float and self.value.is_integer():
-            return int(self.value)
+        value = self.value
+        if type(value) is int:
+            return value
+        # Value.number already folds integral floats, so this is the rare path.
+        # is_integer() stays: int(value) would raise on inf/nan.
+        if type(value) is float and value.is_integer():
+            return int(value)
         return None
 
     def get_string(self) -> str | None:
@@ -195,7 +230,7 @@ class Value:
             mt = self.value.getmetatable()
         else:
             mt = self.get_metatable()
-        index = mt.get(Value.string("__index")) if mt else None
+        index = mt.get(_INDEX_KEY) if mt else None
         if index:
             if index.is_function():
                 if caller is None:
@@ -208,7 +243,7 @@ class Value:
 
     def len(self, caller: LuaCallable | None = None) -> int:
         mt = self.get_metatable()
-        length = mt.get(Value.string("__len")) if mt else None
+        length = mt.get(_LEN_KEY) if mt else None
         if length and length.is_function():
             if caller is None:
                 raise RuntimeError("__len meta method requires a caller")
@@ -226,36 +261,25 @@ class Value:
         return 0
 
     def __hash__(self):
+        # Not cached: str caches its own hash and int/float hashing is cheap,
+        # so a slot would only add a hash() call to every construction.
         return hash(self.value)
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Value):
-            return False
-        return self.value == other.value
+        return type(other) is Value and self.value == other.value
 
     def __repr__(self) -> str:
-        if self.is_nil():
-            return "nil"
-        elif self.is_boolean():
-            return "true" if self.value else "false"
-        elif self.is_string():
-            return f'"{self.value}"'
-        elif self.is_table():
-            return "table"
-        elif self.is_function():
-            return "function"
-        return str(self.value)
+        return _REPR_FORMATTERS.get(self.tag, str)(self.value)
 
     def __str__(self) -> str:
         """String representation for print() - no quotes for strings"""
-        if self.is_nil():
-            return "nil"
-        elif self.is_boolean():
-            return "true" if self.value else "false"
-        elif self.is_string():
-            return str(self.value)
-        elif self.is_table():
-            return "table: " + hex(id(self.value))
-        elif self.is_function():
-            return "function: " + hex(id(self.value))
-        return str(self.value)
+        return _STR_FORMATTERS.get(self.tag, str)(self.value)
+
+
+Value._NIL = Value(None)
+Value._TRUE = Value(True)
+Value._FALSE = Value(False)
+Value._INT_CACHE.update((i, Value(i)) for i in range(-5, 257))
+
+_INDEX_KEY = Value.string("__index")
+_LEN_KEY = Value.string("__len")
@@ -26,6 +26,10 @@ import unittest
 from contextlib import redirect_stdout
 
 from cli import compile_from_source, execute_lua
+from codegen.func import FuncInfo
+from codegen.inst import OP_JMP, OP_LT, OP_TEST, OP_TESTSET, CodegenInst
+from structs.function import Proto
+from vm.operator import OPCODE_HANDLERS
 from vm.state import LuaState
 
 # ---------------------------------------------------------------------------
@@ -308,6 +312,13 @@ class TestVariables(unittest.TestCase):
         """)
         self.assertEqual(out, ["1\t2\tnil"])
 
+    def test_several_missing_values_nil(self):
+        out = run_lua_lines("""
+            local a, b, c, d = 1
+            print(a, b, c, d)
+        """)
+        self.assertEqual(out, ["1\tnil\tnil\tnil"])
+
     def test_local_scope(self):
         out = run_lua_lines("""
             local x = 10
@@ -822,6 +833,16 @@ class TestVarargs(unittest.TestCase):
         """)
         self.assertEqual(out, ["6"])
 
+    def test_vararg_assignment_overwrites_local(self):
+        out = run_lua_lines("local q = 5 q = ... print(q)")
+        self.assertEqual(out, ["nil"])
+
+    def test_vararg_assignment_not_stored_directly(self):
+        proto = compile_from_source("local function f(...) local q = 5 q = ... end", "<test>")
+        varargs = [code for code in proto.protos[0].codes if code.op_name() == "VARARG"]
+        self.assertEqual(len(varargs), 1)
+        self.assertNotEqual(varargs[0].a, 0)
+
 
 # ===================================================================
 # 16. Tables — construction, access, nesting
@@ -871,6 +892,15 @@ class TestTables(unittest.TestCase):
         """)
         self.assertEqual(out, ["5"])
 
+    def test_positional_fields_replace_keyed_field(self):
+        out = run_lua_lines("""
+            local t = {[2] = "x", 10, 20, 30}
+            local n = 0
+            for k, v in pairs(t) do n = n + 1 end
+            print(#t, t[2], n)
+        """)
+        self.assertEqual(out, ["3\t20\t3"])
+
     def test_table_assignment(self):
         out = run_lua_lines("""
             local t = {}
@@ -1402,6 +1432,10 @@ class TestCoercion(unittest.TestCase):
         # 42 .. 0 → concatenates "42" and "0"
         self.assertIn("420", out[0])
 
+    def test_coercion_leaves_operand_string(self):
+        out = run_lua_lines('local s = "5"\nlocal x = s + 1\nprint(type(s), x, type("5"))')
+        self.assertEqual(out, ["string\t6\tstring"])
+
 
 # ===================================================================
 # 25. Comments
@@ -1551,6 +1585,35 @@ class TestCompilationRoundTrip(unittest.TestCase):
         self.assertIsNotNone(proto)
         self.assertTrue(len(proto.codes) > 0)
 
+    def test_default_for_steps_share_constant(self):
+        proto = compile_from_source("for i = 1, 2 do end for j = 1, 3 do end", "<test>")
+        self.assertEqual([k.value for k in proto.consts].count(1), 1)
+
+    def test_missing_locals_share_one_loadnil(self):
+        proto = compile_from_source("local a, b, c, d = 1", "<test>")
+        self.assertEqual([code.op_name() for code in proto.codes].count("LOADNIL"), 1)
+
+    def test_nil_frame_matches_max_stack_size(self):
+        proto = compile_from_source("local function f(a, b) local c = a + b return c end", "<test>")
+        for p in (proto, proto.protos[0]):
+            self.assertEqual(len(p.nil_frame), p.max_stack_size)
+            self.assertTrue(all(value.is_nil() for value in p.nil_frame))
+
+    def test_for_with_literal_bounds_that_never_run_is_dropped(self):
+        def for_ops(source: str) -> list[str]:
+            proto = compile_from_source(source, "<test>")
+            return [code.op_name() for code in proto.codes if code.op_name().startswith("FOR")]
+
+        self.assertEqual(for_ops("for i = 10, 1 do print(i) end"), [])
+        self.assertEqual(for_ops("for i = 1, 1 do print(i) end"), ["FORPREP", "FORLOOP"])
+        self.assertEqual(for_ops("for i = 3, 1, 0 do print(i) end"), ["FORPREP", "FORLOOP"])
+
+    def test_if_block_locals_reuse_condition_register(self):
+        source = "local x = 1 if x then local a, b, c = 1, 2, 3 print(a, b, c) end"
+        self.assertEqual(compile_from_source(source, "<test>").max_stack_size, 8)
+        source = "if false then print(1) else local a = 1 end"
+        self.assertEqual(compile_from_source(source, "<test>").max_stack_size, 1)
+
 
 # ===================================================================
 # 28. Algorithms (integration tests)
@@ -1808,6 +1871,94 @@ class TestComplexControlFlow(unittest.TestCase):
         )
 
 
+class TestFusedBranches(unittest.TestCase):
+    """Compares and TEST/TESTSET followed by a JMP run as one fused handler."""
+
+    @staticmethod
+    def _print_reg(info: FuncInfo, reg: int) -> None:
+        CodegenInst.get_global(info, 2, info.idx_of_const("print"))
+        CodegenInst.move(info, 3, reg)
+        CodegenInst.call(info, 2, 1, 0)
+        CodegenInst.ret(info, 0, 1)
+
+    @staticmethod
+    def _run(info: FuncInfo) -> tuple[Proto, str]:
+        proto = info.to_proto()
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            LuaState(proto).run()
+        return proto, buf.getvalue()
+
+    def test_compare_jump_that_is_also_a_jump_target(self):
+        info = FuncInfo()
+        info.alloc_regs(4)
+        CodegenInst.load_k(info, 0, 0)  # 0: i = 0
+        CodegenInst.jmp(info, 1)  # 1: enter the loop through the compare's JMP
+        CodegenInst.LT(info, 1, 0, 256 + info.idx_of_const(3))  # 2: i < 3
+        CodegenInst.jmp(info, 1)  # 3: -> body
+        CodegenInst.jmp(info, 2)  # 4: -> exit
+        CodegenInst.PLUS(info, 0, 0, 256 + info.idx_of_const(1))  # 5: i = i + 1
+        CodegenInst.jmp(info, -5)  # 6: -> compare
+        self._print_reg(info, 0)  # 7: exit
+        proto, out = self._run(info)
+        self.assertIsNot(proto.codes[2].handler, OPCODE_HANDLERS[OP_LT])
+        self.assertIs(proto.codes[3].handler, OPCODE_HANDLERS[OP_JMP])
+        self.assertEqual(out, "3\n")
+
+    def test_test_jump_that_is_also_a_jump_target(self):
+        info = FuncInfo()
+        info.alloc_regs(4)
+        CodegenInst.load_k(info, 0, 0)  # 0: count = 0
+        CodegenInst.load_bool(info, 1, 1, 0)  # 1: flag = true
+        CodegenInst.jmp(info, 1)  # 2: enter the loop through the TEST's JMP
+        CodegenInst.test(info, 1, 0)  # 3: a falsy flag skips the JMP
+        CodegenInst.jmp(info, 1)  # 4: -> body
+        CodegenInst.jmp(info, 3)  # 5: -> exit
+        CodegenInst.PLUS(info, 0, 0, 256 + info.idx_of_const(1))  # 6: count = count + 1
+        CodegenInst.load_nil(info, 1, 1)  # 7: flag = nil
+        CodegenInst.jmp(info, -6)  # 8: -> TEST
+        self._print_reg(info, 0)  # 9: exit
+        proto, out = self._run(info)
+        self.assertIsNot(proto.codes[3].handler, OPCODE_HANDLERS[OP_TEST])
+        self.assertIs(proto.codes[4].handler, OPCODE_HANDLERS[OP_JMP])
+        self.assertEqual(out, "1\n")
+
+    def test_testset_writes_target_on_taken_jump(self):
+        for value, expected in ((False, "rhs"), (None, "rhs"), (0, "0"), ("", "")):
+            with self.subTest(value=value):
+                info = FuncInfo()
+                info.alloc_regs(4)
+                if value is None:
+                    CodegenInst.load_nil(info, 0, 1)
+                elif value is False:
+                    CodegenInst.load_bool(info, 0, 0, 0)
+                else:
+                    CodegenInst.load_k(info, 0, value)
+                CodegenInst.load_k(info, 1, "unset")
+                CodegenInst.testset(info, 1, 0, 0)  # 2: truthy R0 -> R1 = R0, take JMP
+                CodegenInst.jmp(info, 1)  # 3: -> print
+                CodegenInst.load_k(info, 1, "rhs")  # 4
+                self._print_reg(info, 1)
+                proto, out = self._run(info)
+                self.assertIsNot(proto.codes[2].handler, OPCODE_HANDLERS[OP_TESTSET])
+                self.assertEqual(out, expected + "\n")
+
+    def test_or_operand_values(self):
+        for value, expected in (("false", "2"), ("nil", "2"), ("0", "0"), ('""', "")):
+            with self.subTest(value=value):
+                out = run_lua(f"local x = {value} local y = 2 local a = x or y print(a)")
+                self.assertEqual(out, expected + "\n")
+
+    def test_compare_at_last_pc_keeps_generic_handler(self):
+        info = FuncInfo()
+        info.alloc_regs(1)
+        CodegenInst.load_k(info, 0, 5)
+        CodegenInst.LT(info, 1, 0, 256 + info.idx_of_const(3))  # last pc, no JMP follows
+        proto, out = self._run(info)
+        self.assertIs(proto.codes[-1].handler, OPCODE_HANDLERS[OP_LT])
+        self.assertEqual(out, "")
+
+
 # ===================================================================
 # 30. Table iteration patterns
 # ===================================================================
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sys
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,11 +14,8 @@ from structs.value import Value
 class BUILTIN:
     @staticmethod
     def lua_print(state: LuaState) -> int:
-        n = state.gettop()
-        outputs: list[str] = []
-        for i in range(n):
-            outputs.append(str(state.stack[i]))
-        print("\t".join(outputs))
+        # The whole stack is the argument list; one write skips print()'s sep/end handling
+        sys.stdout.write("\t".join([str(value) for value in state.stack]) + "\n")
         return 0
 
     @staticmethod
@@ -213,11 +211,10 @@ class BUILTIN:
         from structs.table import Table
 
         table = state.stack[0]
-        index = state.stack[1]
         if not table.is_table():
             raise TypeError("ipairsaux expects a table")
-        index.conv_str_to_number()
-        if not index.is_number():
+        index = state.stack[1].to_str_number()
+        if index is None:
             raise TypeError("ipairsaux index must be a number")
 
         assert type(index.value) is int
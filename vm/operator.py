@@ -3,38 +3,30 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from operator import add, mul, sub, truediv
 from typing import TYPE_CHECKING, cast
 
-from structs.function import LClosure
+from codegen.inst import (
+    OP_EQ,
+    OP_JMP,
+    OP_LE,
+    OP_LT,
+    OP_TEST,
+    OP_TESTSET,
+    OPCODES,
+    OpArgK,
+    OpMode,
+)
+from structs.function import LClosure, Proto
 from structs.instruction import Instruction
 from structs.table import Table
-from structs.value import Value
-from vm.protocols import LuaCheckable
+from structs.value import TAG_FUNCTION, TAG_NIL, TAG_NUMBER, TAG_STRING, TAG_TABLE, Value
 
 if TYPE_CHECKING:
     from .state import LuaState
 
-
-class CheckNumber(LuaCheckable):
-    @staticmethod
-    def check(val: Value) -> bool:
-        return val.conv_str_to_number()
-
-    @staticmethod
-    def checks(va: Value, vb: Value) -> bool:
-        return CheckNumber.check(va) and CheckNumber.check(vb)
-
-
-class CompareCheck(LuaCheckable):
-    @staticmethod
-    def check(val: Value) -> bool:
-        raise RuntimeError("CompareCheck.check should not be called")
-
-    @staticmethod
-    def checks(va: Value, vb: Value) -> bool:
-        if va.is_number() and vb.is_number():
-            return True
-        return va.is_string() and vb.is_string()
+# Metatable key probed by SETTABLE on a missing field
+_NEWINDEX_KEY = Value.string("__newindex")
 
 
 type UnaryFuncType = Callable[[int | float | bool], int | float | bool]
@@ -45,24 +37,25 @@ type BinaryFuncType = ArithFuncType | CompareFuncType
 
 class UnaryOperator:
     op: UnaryFuncType
-    check: LuaCheckable
     meta: str
+    meta_key: Value  # meta as a table key, built once
 
-    def __init__(self, op: UnaryFuncType, check: LuaCheckable, meta: str):
+    def __init__(self, op: UnaryFuncType, meta: str):
         self.op = op
         self.meta = meta
-        self.check = check
+        self.meta_key = Value.string(meta)
 
     def solve(self, state: LuaState, a: int) -> Value | bool:
         va = state.get_rk(a)
-        mt = va.get_metatable()
-        if self.check.check(va):
-            assert isinstance(va.value, (int, float))
-            return Value.number(self.op(va.value))
+        num = va.to_str_number()
+        if num is not None:
+            assert isinstance(num.value, (int, float))
+            return Value.number(self.op(num.value))
         else:
+            mt = va.get_metatable()
             if mt:
-                meta_func = mt.get(Value.string(self.meta))
-                if meta_func and meta_func.is_function():
+                meta_func = mt.get(self.meta_key)
+                if meta_func and meta_func.tag == TAG_FUNCTION:
                     assert type(meta_func.value) is LClosure
                     return state.lua_call(meta_func.value, va)
         return False
@@ -79,19 +72,22 @@ class UnaryOperator:
 
 class BinaryOperator:
     op: BinaryFuncType
-    check: LuaCheckable
     meta: str
+    meta_key: Value  # meta as a table key, built once
+    is_compare: bool  # EQ/LT/LE: op returns a bool and only same-type numbers or strings compare
 
-    def __init__(self, op: BinaryFuncType, check: LuaCheckable, meta: str):
+    def __init__(self, op: BinaryFuncType, meta: str, is_compare: bool = False):
         self.op = op
         self.meta = meta
-        self.check = check
+        self.meta_key = Value.string(meta)
+        self.is_compare = is_compare
 
     def _solve_compare(self, va: Value, vb: Value) -> Value | None:
         # __eq has a raw fast path for same-type equal values.
-        if self.meta == "__eq" and va.type_name() == vb.type_name() and va == vb:
+        if self.meta == "__eq" and va.tag == vb.tag and va == vb:
             return Value.boolean(True)
-        if not self.check.checks(va, vb):
+        tag = va.tag
+        if tag != vb.tag or tag not in (TAG_NUMBER, TAG_STRING):
             return None
 
         compare_op = cast(CompareFuncType, self.op)
@@ -100,11 +96,14 @@ class BinaryOperator:
         return None
 
     def _solve_arith(self, va: Value, vb: Value) -> Value | None:
-        if not self.check.checks(va, vb):
+        # Coerce into fresh Values: operands may be shared constants or interned strings.
+        na = va.to_str_number()
+        nb = vb.to_str_number()
+        if na is None or nb is None:
             return None
-        assert isinstance(va.value, (int, float)) and isinstance(vb.value, (int, float))
+        assert isinstance(na.value, (int, float)) and isinstance(nb.value, (int, float))
         arith_op = cast(ArithFuncType, self.op)
-        return Value.number(arith_op(va.value, vb.value))
+        return Value.number(arith_op(na.value, nb.value))
 
     def _call_metamethod(self, state: LuaState, va: Value, vb: Value) -> Value | None:
         mt = va.get_metatable()
@@ -112,8 +111,8 @@ class BinaryOperator:
             mt = vb.get_metatable()
         if not mt:
             return None
-        meta_func = mt.get(Value.string(self.meta))
-        if meta_func and meta_func.is_function():
+        meta_func = mt.get(self.meta_key)
+        if meta_func and meta_func.tag == TAG_FUNCTION:
             assert type(meta_func.value) is LClosure
             return state.lua_call(meta_func.value, va, vb)
         return None
@@ -121,9 +120,7 @@ class BinaryOperator:
     def solve(self, state: LuaState, a: int, b: int) -> Value | bool:
         va = state.get_rk(a)
         vb = state.get_rk(b)
-        direct = (
-            self._solve_compare(va, vb) if self.check is CompareCheck else self._solve_arith(va, vb)
-        )
+        direct = self._solve_compare(va, vb) if self.is_compare else self._solve_arith(va, vb)
         if direct is not None:
             return direct
 
@@ -144,6 +141,11 @@ class BinaryOperator:
             )
 
     def compare(self, state: LuaState, a: int, b: int) -> bool:
+        x = state.get_rk(a).value
+        y = state.get_rk(b).value
+        if (type(x) is int or type(x) is float) and (type(y) is int or type(y) is float):
+            # Two numbers: compare directly, without boxing the result or checking metatables
+            return cast(CompareFuncType, self.op)(x, y)
         res = self.solve(state, a, b)
         if type(res) is Value:
             return bool(res.value)
@@ -151,39 +153,59 @@ class BinaryOperator:
 
 
 UNARY_ARITH = {
-    "UNM": UnaryOperator(lambda a: -a, CheckNumber, "__unm"),
-    "BONA": UnaryOperator(lambda a: not a, CheckNumber, "__bnot"),
+    "UNM": UnaryOperator(lambda a: -a, "__unm"),
+    "BONA": UnaryOperator(lambda a: not a, "__bnot"),
 }
 
 
 BINARY_ARITH = {
-    "ADD": BinaryOperator(lambda a, b: a + b, CheckNumber, "__add"),
-    "SUB": BinaryOperator(lambda a, b: a - b, CheckNumber, "__sub"),
-    "MUL": BinaryOperator(lambda a, b: a * b, CheckNumber, "__mul"),
-    "DIV": BinaryOperator(lambda a, b: a / b, CheckNumber, "__div"),
-    "MOD": BinaryOperator(lambda a, b: a % b, CheckNumber, "__mod"),
-    "POW": BinaryOperator(lambda a, b: a**b, CheckNumber, "__pow"),
-    "EQ": BinaryOperator(lambda a, b: a == b, CompareCheck, "__eq"),
-    "LT": BinaryOperator(lambda a, b: a < b, CompareCheck, "__lt"),
-    "LE": BinaryOperator(lambda a, b: a <= b, CompareCheck, "__le"),
+    "ADD": BinaryOperator(lambda a, b: a + b, "__add"),
+    "SUB": BinaryOperator(lambda a, b: a - b, "__sub"),
+    "MUL": BinaryOperator(lambda a, b: a * b, "__mul"),
+    "DIV": BinaryOperator(lambda a, b: a / b, "__div"),
+    "MOD": BinaryOperator(lambda a, b: a % b, "__mod"),
+    "POW": BinaryOperator(lambda a, b: a**b, "__pow"),
+    "EQ": BinaryOperator(lambda a, b: a == b, "__eq", is_compare=True),
+    "LT": BinaryOperator(lambda a, b: a < b, "__lt", is_compare=True),
+    "LE": BinaryOperator(lambda a, b: a <= b, "__le", is_compare=True),
 }
 
 
+def _numeric_arith(name: str, op: ArithFuncType) -> Callable[[Instruction, LuaState], None]:
+    """Build an arithmetic handler with an inline path for two plain numbers.
+
+    Numbers never carry metatables, so when both operands are int/float the
+    result is computed directly; everything else goes through BINARY_ARITH.
+    """
+    generic = BINARY_ARITH[name]
+
+    def handler(inst: Instruction, state: LuaState):
+        b, c = inst.b, inst.c
+        x = (inst.kb or state.stack[b]).value
+        y = (inst.kc or state.stack[c]).value
+        if (type(x) is int or type(x) is float) and (type(y) is int or type(y) is float):
+            state.stack[inst.a] = Value.number(op(x, y))
+        else:
+            generic.arith(state, inst.a, b, c)
+
+    return handler
+
+
 # ruff:noqa: N802 - Follows Lua's opcode naming convention
 class Operator:
     @staticmethod
     def MOVE(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         state.stack[a] = state.stack[b]
 
     @staticmethod
     def LOADK(inst: Instruction, state: LuaState):
-        a, bx = inst.abx()
+        a, bx = inst.a, inst.bx
         state.stack[a] = state.func.consts[bx]
 
     @staticmethod
     def LOADBOOL(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         state.stack[a] = Value.boolean(bool(b))
         if c != 0:
             assert type(state.call_info[-1]) is LClosure
@@ -191,13 +213,12 @@ class Operator:
 
     @staticmethod
     def LOADNIL(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
-        for i in range(a, b + 1):
-            state.stack[i] = Value.nil()
+        a, b = inst.a, inst.b
+        state.stack[a : b + 1] = [Value.nil()] * (b - a + 1)
 
     @staticmethod
     def GETUPVAL(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         closure = state.call_info[-1]
         if b < len(closure.upvalues):
             state.stack[a] = closure.upvalues[b]
@@ -206,32 +227,33 @@ class Operator:
 
     @staticmethod
     def GETGLOBAL(inst: Instruction, state: LuaState):
-        a, bx = inst.abx()
-        name = state.func.consts[bx].value
-        assert type(name) is str
-        state.stack[a] = state.get_global(name)
+        # The name constant is already a string Value: use it as the key as-is.
+        value = state.globals.get(state.func.consts[inst.bx])
+        state.stack[inst.a] = value if value is not None else Value.nil()
 
     @staticmethod
     def GETTABLE(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         table_value = state.stack[b]
-        key = state.get_rk(c)
-        if table_value.is_table():
-            result = state.gettable(b, key)
+        key = inst.kc or state.stack[c]
+        if table_value.tag == TAG_TABLE:
+            table = table_value.value
+            assert type(table) is Table
+            # Raw hit first; only a miss on a table with a metatable can reach __index.
+            result = table.get(key)
+            if result is None:
+                result = state.gettable(b, key) if table.getmetatable() else Value.nil()
             state.stack[a] = result
         else:
             state.stack[a] = Value.nil()
 
     @staticmethod
     def SETGLOBAL(inst: Instruction, state: LuaState):
-        a, bx = inst.abx()
-        name = state.func.consts[bx].value
-        assert type(name) is str
-        state.set_global(name, state.stack[a])
+        state.globals.set(state.func.consts[inst.bx], state.stack[inst.a])
 
     @staticmethod
     def SETUPVAL(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         closure = state.call_info[-1]
         if b < len(closure.upvalues):
             closure.upvalues[b] = state.stack[a]
@@ -240,33 +262,34 @@ class Operator:
 
     @staticmethod
     def SETTABLE(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         table_value = state.stack[a]
-        key = state.get_rk(b)
-        value = state.get_rk(c)
-        if table_value.is_table():
-            assert isinstance(table_value.value, Table)
-            existing = table_value.value.get(key)
-            mt = table_value.get_metatable()
-            if existing is not None or mt is None:
-                table_value.value.set(key, value)
+        key = inst.kb or state.stack[b]
+        value = inst.kc or state.stack[c]
+        if table_value.tag == TAG_TABLE:
+            table = table_value.value
+            assert type(table) is Table
+            # Plain tables skip the existing-key probe that only __newindex needs.
+            mt = table.getmetatable()
+            if mt is None or table.get(key) is not None:
+                table.set(key, value)
                 return
-            new_index = mt.get(Value.string("__newindex"))
-            if new_index and new_index.is_function():
+            new_index = mt.get(_NEWINDEX_KEY)
+            if new_index and new_index.tag == TAG_FUNCTION:
                 assert type(new_index.value) is LClosure
                 state.lua_call(new_index.value, table_value, key, value)
                 return
-            if new_index and new_index.is_table():
+            if new_index and new_index.tag == TAG_TABLE:
                 assert isinstance(new_index.value, Table)
                 new_index.value.set(key, value)
                 return
-            table_value.value.set(key, value)
+            table.set(key, value)
         else:
             # Try __newindex meta method
             mt = table_value.get_metatable()
             if mt:
-                new_index = mt.get(Value.string("__newindex"))
-                if new_index and new_index.is_function():
+                new_index = mt.get(_NEWINDEX_KEY)
+                if new_index and new_index.tag == TAG_FUNCTION:
                     assert type(new_index.value) is LClosure
                     state.lua_call(new_index.value, table_value, key, value)
                     return
@@ -274,37 +297,26 @@ class Operator:
 
     @staticmethod
     def NEWTABLE(inst: Instruction, state: LuaState):
-        a, _, _ = inst.abc()
+        a = inst.a
         state.stack[a] = Value.table(Table())
 
     @staticmethod
     def SELF(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         state.stack[a + 1] = state.stack[b]
-        key = state.get_rk(c)
+        key = inst.kc or state.stack[c]
         result = state.gettable(b, key)
         state.stack[a] = result
 
     @staticmethod
     def _arith_op(name: str, inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         BINARY_ARITH[name].arith(state, a, b, c)
 
-    @staticmethod
-    def ADD(inst: Instruction, state: LuaState):
-        Operator._arith_op("ADD", inst, state)
-
-    @staticmethod
-    def SUB(inst: Instruction, state: LuaState):
-        Operator._arith_op("SUB", inst, state)
-
-    @staticmethod
-    def MUL(inst: Instruction, state: LuaState):
-        Operator._arith_op("MUL", inst, state)
-
-    @staticmethod
-    def DIV(inst: Instruction, state: LuaState):
-        Operator._arith_op("DIV", inst, state)
+    ADD = staticmethod(_numeric_arith("ADD", add))
+    SUB = staticmethod(_numeric_arith("SUB", sub))
+    MUL = staticmethod(_numeric_arith("MUL", mul))
+    DIV = staticmethod(_numeric_arith("DIV", truediv))
 
     @staticmethod
     def MOD(inst: Instruction, state: LuaState):
@@ -316,41 +328,44 @@ class Operator:
 
     @staticmethod
     def UNM(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
-        UNARY_ARITH["UNM"].arith(state, a, b)
+        a, b = inst.a, inst.b
+        x = state.stack[b].value
+        if type(x) is int or type(x) is float:
+            state.stack[a] = Value.number(-x)
+        else:
+            UNARY_ARITH["UNM"].arith(state, a, b)
 
     @staticmethod
     def NOT(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         state.stack[a] = Value.boolean(not state.stack[b].get_boolean())
 
     @staticmethod
     def LEN(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         state.stack[a] = Value.number(state.len(b))
 
     @staticmethod
     def CONCAT(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
-        parts: list[str] = []
-        for i in range(b, c + 1):
-            val = state.stack[i]
-            s = val.get_string()
-            if s is not None:
-                parts.append(s)
+        a, b, c = inst.a, inst.b, inst.c
+        values = state.stack[b : c + 1]
+        parts = [s for val in values if type(s := val.value) is str]
+        if len(parts) != len(values):
+            # Not all strings: numbers convert through get_string, others are skipped
+            parts = [s for val in values if (s := val.get_string()) is not None]
         state.stack[a] = Value.string("".join(parts))
 
     @staticmethod
     def JMP(inst: Instruction, state: LuaState):
-        _, sbx = inst.asbx()
+        sbx = inst.sbx
         state.jump(sbx)
 
     @staticmethod
     def _compare_op(name: str, inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         if BINARY_ARITH[name].compare(state, b, c) == (a != 0):
             next_inst = state.fetch()
-            assert type(next_inst) is Instruction and next_inst.op_name() == "JMP"
+            assert type(next_inst) is Instruction and next_inst.op_idx() == OP_JMP
             Operator.JMP(next_inst, state)
         else:
             assert type(state.call_info[-1]) is LClosure
@@ -370,13 +385,13 @@ class Operator:
 
     @staticmethod
     def TEST(inst: Instruction, state: LuaState):
-        a, _, c = inst.abc()
+        a, c = inst.a, inst.c
         if state.stack[a].get_boolean() == bool(c):
             state.jump(1)
 
     @staticmethod
     def TESTSET(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         if state.stack[b].get_boolean() == (c != 0):
             # Condition matches C → skip JMP (evaluate right side, no short-circuit)
             assert type(state.call_info[-1]) is LClosure
@@ -387,67 +402,66 @@ class Operator:
 
     @staticmethod
     def CALL(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         nargs = b - 1 if b != 0 else len(state.stack) - a - 1
         num_rets = c - 1
         state.call(a, nargs, num_rets)
 
     @staticmethod
     def TAILCALL(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         nargs = b - 1 if b != 0 else len(state.stack) - a - 1
         state.call(a, nargs, -1)
 
     @staticmethod
     def RETURN(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         ret_count = b - 1 if b != 0 else len(state.stack) - a
         state.pos_call(a, ret_count)
 
     @staticmethod
     def FORLOOP(inst: Instruction, state: LuaState):
-        a, sbx = inst.asbx()
-        step = state.stack[a + 2]
-        idx = state.stack[a]
-        assert isinstance(idx.value, (int, float))
-        assert isinstance(step.value, (int, float))
-        new_idx = Value.number(idx.value + step.value)
-        state.stack[a] = new_idx
-        limit = state.stack[a + 1]
-        assert isinstance(new_idx.value, (int, float))
-        assert isinstance(limit.value, (int, float))
-
-        if (step.value > 0 and new_idx.value <= limit.value) or (
-            step.value <= 0 and new_idx.value >= limit.value
-        ):
-            state.jump(sbx)
-            state.stack[a + 3] = new_idx
+        a = inst.a
+        stack = state.stack
+        step = stack[a + 2].value
+        # FORPREP has checked that index, limit and step are numbers
+        idx: int | float = stack[a].value + step  # type: ignore[operator, assignment]
+        new_idx = Value.number(idx)
+        stack[a] = new_idx
+        limit = stack[a + 1].value
+        if idx <= limit if step > 0 else idx >= limit:  # type: ignore[operator]
+            frame = state.call_info[-1]
+            assert type(frame) is LClosure
+            frame.pc += inst.sbx
+            stack[a + 3] = new_idx
 
     @staticmethod
     def FORPREP(inst: Instruction, state: LuaState):
-        a, sbx = inst.asbx()
+        a, sbx = inst.a, inst.sbx
         init = state.stack[a]
         step = state.stack[a + 2]
+        # Checked once here, so FORLOOP can add and compare without re-checking
         assert isinstance(init.value, (int, float))
+        assert isinstance(state.stack[a + 1].value, (int, float))
         assert isinstance(step.value, (int, float))
         state.stack[a] = Value.number(init.value - step.value)
         state.jump(sbx)
 
     @staticmethod
     def TFORLOOP(inst: Instruction, state: LuaState):
-        a, _, c = inst.abc()
+        a, c = inst.a, inst.c
         state.stack[a + 3] = state.stack[a]
         state.stack[a + 4] = state.stack[a + 1]
         state.stack[a + 5] = state.stack[a + 2]
         state.call(a + 3, 2, c)
-        if not state.stack[a + 3].is_nil():
+        if state.stack[a + 3].tag != TAG_NIL:
             state.stack[a + 2] = state.stack[a + 3]
         else:
             state.jump(1)
 
     @staticmethod
     def SETLIST(inst: Instruction, state: LuaState):
-        a, b, c = inst.abc()
+        a, b, c = inst.a, inst.b, inst.c
         table = state.stack[a]
         if not table.is_table():
             raise TypeError("SETLIST expects a table")
@@ -456,8 +470,7 @@ class Operator:
         n = b if b != 0 else len(state.stack) - a - 1
         base = (c - 1) * 50
 
-        for i in range(1, n + 1):
-            table.value.set(base + i, state.stack[a + i])
+        table.value.set_list(base + 1, state.stack[a + 1 : a + 1 + n])
 
     @staticmethod
     def CLOSE(inst: Instruction, state: LuaState):
@@ -465,14 +478,14 @@ class Operator:
 
     @staticmethod
     def CLOSURE(inst: Instruction, state: LuaState):
-        a, bx = inst.abx()
+        a, bx = inst.a, inst.bx
         proto = state.func.protos[bx]
         closure = LClosure.from_proto(proto)
         state.stack[a] = Value.closure(closure)
 
     @staticmethod
     def VARARG(inst: Instruction, state: LuaState):
-        a, b, _ = inst.abc()
+        a, b = inst.a, inst.b
         closure = state.call_info[-1]
         assert type(closure) is LClosure
         n = b - 1 if b != 0 else len(closure.varargs)
@@ -489,3 +502,116 @@ DISPATCH_TABLE: dict[str, Callable[[Instruction, LuaState], None]] = {
     for name in dir(Operator)
     if not name.startswith("_") and callable(getattr(Operator, name))
 }
+
+# Handlers indexed by opcode number. Every opcode must have one: a missing
+# handler fails here at import, not when the instruction is first executed.
+OPCODE_HANDLERS: tuple[Callable[[Instruction, LuaState], None], ...] = tuple(
+    DISPATCH_TABLE[opcode.name] for opcode in OPCODES
+)
+
+
+# Per opcode: whether B and C are RK operands, so bind_handlers resolves their constants
+_RK_OPERANDS = [
+    (
+        opcode.mode == OpMode.iABC and opcode.argb == OpArgK,
+        opcode.mode == OpMode.iABC and opcode.argc == OpArgK,
+    )
+    for opcode in OPCODES
+]
+
+# Compare opcodes that bind_handlers fuses with the JMP that follows them
+_COMPARE_NAMES = {OP_EQ: "EQ", OP_LT: "LT", OP_LE: "LE"}
+
+# Fused compare-jump handlers, shared by every instruction with the same
+# (name, expected result, sBx)
+_COMPARE_JUMP_HANDLERS: dict[tuple[str, bool, int], Callable[[Instruction, LuaState], None]] = {}
+
+
+def _compare_jump(name: str, expect: bool, jump: int) -> Callable[[Instruction, LuaState], None]:
+    """Get the handler for compare `name` fused with a following `JMP jump`.
+
+    The JMP is never dispatched: the pc advance for both outcomes is fixed
+    here, so the handler just indexes it by whether the comparison matched.
+    """
+    key = (name, expect, jump)
+    handler = _COMPARE_JUMP_HANDLERS.get(key)
+    if handler is None:
+        compare = BINARY_ARITH[name].compare
+        deltas = (1, 1 + jump)  # (skip the JMP, take it)
+
+        def handler(inst: Instruction, state: LuaState):
+            frame = state.call_info[-1]
+            assert type(frame) is LClosure
+            frame.pc += deltas[compare(state, inst.b, inst.c) is expect]
+
+        _COMPARE_JUMP_HANDLERS[key] = handler
+    return handler
+
+
+# Fused TEST/TESTSET-jump handlers, keyed by (opcode, C operand, sBx)
+_TEST_JUMP_HANDLERS: dict[tuple[int, bool, int], Callable[[Instruction, LuaState], None]] = {}
+
+
+def _test_jump(op_idx: int, expect: bool, jump: int) -> Callable[[Instruction, LuaState], None]:
+    """Get the handler for TEST or TESTSET with operand C `expect` fused with a following JMP.
+
+    C is fixed per site, so the truth test it selects is baked in here; a value
+    whose truth matches C skips the JMP, any other takes it.
+    """
+    key = (op_idx, expect, jump)
+    handler = _TEST_JUMP_HANDLERS.get(key)
+    if handler is None:
+        deltas = (1 + jump, 1)  # (take the JMP, skip it)
+        if op_idx == OP_TEST:
+
+            def handler(inst: Instruction, state: LuaState):
+                value = state.stack[inst.a].value
+                frame = state.call_info[-1]
+                assert type(frame) is LClosure
+                frame.pc += deltas[(value is not None and value is not False) is expect]
+
+        else:
+
+            def handler(inst: Instruction, state: LuaState):
+                stack = state.stack
+                source = stack[inst.b]
+                value = source.value
+                frame = state.call_info[-1]
+                assert type(frame) is LClosure
+                if (value is not None and value is not False) is expect:
+                    frame.pc += 1
+                else:
+                    stack[inst.a] = source
+                    frame.pc += 1 + jump
+
+        _TEST_JUMP_HANDLERS[key] = handler
+    return handler
+
+
+def bind_handlers(proto: Proto) -> None:
+    """Attach each instruction's handler, for proto and all nested protos.
+
+    The fetch loop then calls inst.handler directly instead of indexing
+    OPCODE_HANDLERS by op_idx() on every step. Constant RK operands are
+    resolved here too, so handlers skip get_rk's branch and index math.
+    """
+    codes = proto.codes
+    consts = proto.consts
+    last = len(codes) - 1
+    for pc, inst in enumerate(codes):
+        op_idx = inst.op_idx()
+        rk_b, rk_c = _RK_OPERANDS[op_idx]
+        if rk_b and inst.b > 255:
+            inst.kb = consts[inst.b - 256]
+        if rk_c and inst.c > 255:
+            inst.kc = consts[inst.c - 256]
+        name = _COMPARE_NAMES.get(op_idx)
+        jumps_next = pc < last and codes[pc + 1].op_idx() == OP_JMP
+        if name is not None and jumps_next:
+            inst.handler = _compare_jump(name, inst.a != 0, codes[pc + 1].sbx)
+        elif op_idx in (OP_TEST, OP_TESTSET) and jumps_next:
+            inst.handler = _test_jump(op_idx, inst.c != 0, codes[pc + 1].sbx)
+        else:
+            inst.handler = OPCODE_HANDLERS[op_idx]
+    for child in proto.protos:
+        bind_handlers(child)
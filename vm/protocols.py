@@ -15,11 +15,3 @@ if TYPE_CHECKING:
 
 class LuaCallable(Protocol):
     def __call__(self, func: LClosure, *args: Value) -> Value: ...
-
-
-class LuaCheckable(Protocol):
-    @staticmethod
-    def check(val: Value) -> bool: ...
-
-    @staticmethod
-    def checks(va: Value, vb: Value) -> bool: ...
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from codegen.inst import OP_RETURN
 from structs.function import LClosure, PClosure, Proto
 from structs.instruction import Instruction
 from structs.table import Table
-from structs.value import Value
+from structs.value import TAG_FUNCTION, TAG_TABLE, Value
 from vm.builtins import BUILTIN
-from vm.operator import DISPATCH_TABLE
+from vm.operator import OPCODE_HANDLERS, bind_handlers
 
 if TYPE_CHECKING:
     from structs.function import PyFunction
@@ -23,6 +24,9 @@ LUA_ERR_SYNTAX = 3
 LUA_ERR_MEM = 4
 LUA_ERR_ERR = 5
 
+# Metatable key probed when calling a non-function value
+_CALL_KEY = Value.string("__call")
+
 
 class LuaState:
     call_info: list[LClosure | PClosure]
@@ -35,6 +39,7 @@ class LuaState:
     mt: Table
 
     def __init__(self, main: Proto):
+        bind_handlers(main)
         call_info = LClosure.from_proto(main)
         self.registry = Table()
         key = Value.number(LUA_GLOBALS_INDEX)
@@ -104,8 +109,8 @@ class LuaState:
 
     # external meta methods
     def pop(self, n: int) -> None:
-        for _ in range(n):
-            self.stack.pop()
+        if n > 0:
+            del self.stack[-n:]
 
     def remove(self, idx: int) -> None:
         assert idx != 0, "Index cannot be zero"
@@ -118,10 +123,11 @@ class LuaState:
         return len(self.stack)
 
     def settop(self, idx: int):
-        while len(self.stack) > idx:
-            self.stack.pop()
-        while len(self.stack) < idx:
-            self.stack.append(Value.nil())
+        stack = self.stack
+        if len(stack) > idx:
+            del stack[idx:]
+        else:
+            stack.extend([Value.nil()] * (idx - len(stack)))
 
     def pushstring(self, s: str):
         self.stack.append(Value.string(s))
@@ -181,17 +187,18 @@ class LuaState:
 
     def call(self, idx: int, nargs: int, num_rets: int):
         func_value = self.stack[idx]
-        if func_value.is_function():
-            if type(func_value.value) is LClosure:
-                self.pre_call(func_value.value, idx, nargs, num_rets)
-                while self.execute():
-                    pass
-            elif type(func_value.value) is PClosure:
-                self.py_call(func_value.value, idx, nargs, num_rets)
-        elif func_value.is_table():
+        tag = func_value.tag
+        if tag == TAG_FUNCTION:
+            closure = func_value.value
+            if type(closure) is LClosure:
+                self.pre_call(closure, idx, nargs, num_rets)
+                self.run_until_return()
+            elif type(closure) is PClosure:
+                self.py_call(closure, idx, nargs, num_rets)
+        elif tag == TAG_TABLE:
             mt = func_value.get_metatable()
-            callable_value = mt.get(Value("__call")) if mt else None
-            if callable_value and callable_value.is_function():
+            callable_value = mt.get(_CALL_KEY) if mt else None
+            if callable_value and callable_value.tag == TAG_FUNCTION:
                 assert type(callable_value.value) is LClosure
                 self.stack[idx] = self.lua_call(
                     callable_value.value, *self.stack[idx : idx + nargs + 1]
@@ -226,51 +233,56 @@ class LuaState:
         raise RuntimeError(value.value)
 
     def run(self):
-        """Top-level execution loop. Runs until all instructions are consumed."""
+        """Top-level execution loop. Runs the main chunk until it returns."""
+        if self.call_info:
+            self.run_until_return()
+
+    def run_until_return(self):
+        """Execute the current frame until its RETURN. Used for nested calls.
+
+        Calls made by the frame run to completion inside their CALL handler, so
+        the frame stays on top until its own RETURN: its code list and handler
+        lookups are bound to locals once, and only pc is re-read per step
+        (jumps update it through the frame).
+        """
+        frame = self.call_info[-1]
+        assert type(frame) is LClosure
+        codes = frame.func.codes
+        num_codes = len(codes)
+        return_handler = OPCODE_HANDLERS[OP_RETURN]
         while True:
-            inst = self.fetch()
-            if inst is None:
-                break
-            op_name = inst.op_name()
-            method = DISPATCH_TABLE.get(op_name)
-            if method:
-                method(inst, self)
-            else:
-                raise RuntimeError(f"unknown opcode: {op_name}")
-
-    def execute(self) -> bool:
-        """Execute a single instruction. Used for nested calls (stops on RETURN)."""
-        inst = self.fetch()
-        if inst is None:
-            return False
-        op_name = inst.op_name()
-        method = DISPATCH_TABLE.get(op_name)
-        if method:
-            method(inst, self)
-        else:
-            raise RuntimeError(f"unknown opcode: {op_name}")
-        return op_name != "RETURN"
+            pc = frame.pc
+            if pc >= num_codes:
+                return
+            frame.pc = pc + 1
+            inst = codes[pc]
+            handler = inst.handler
+            handler(inst, self)
+            if handler is return_handler:
+                return
 
     def pre_call(self, closure: LClosure, func_idx: int = 0, nargs: int = 0, num_rets: int = 0):
-        closure.stack = [Value.nil()] * closure.func.max_stack_size
+        func = closure.func
+        num_params = func.num_params
+        start = func_idx + 1
+        end = start + nargs
+        stack = func.nil_frame.copy()
+        # Fixed parameters start the new frame; any extra arguments are varargs.
+        if nargs <= num_params:
+            stack[:nargs] = self.stack[start:end]
+            closure.varargs = []
+        else:
+            stack[:num_params] = self.stack[start : start + num_params]
+            closure.varargs = self.stack[start + num_params : end]
+        closure.stack = stack
         closure.pc = 0
-        closure.varargs = []
-        for i in range(nargs):
-            value = self.stack[func_idx + 1 + i]
-            if i < closure.func.num_params:
-                closure.stack[i] = value
-            else:
-                closure.varargs.append(value)
 
         closure.num_rets = num_rets
         closure.ret_idx = func_idx
         self.push_closure(closure)
 
     def py_call(self, closure: PClosure, func_idx: int = 0, args_count: int = 0, num_rets: int = 0):
-        closure.stack = []
-        for i in range(args_count):
-            value = self.stack[func_idx + 1 + i]
-            closure.stack.append(value)
+        closure.stack = self.stack[func_idx + 1 : func_idx + 1 + args_count]
 
         self.push_closure(closure)
         ret_count = closure.func(self)
@@ -328,8 +340,7 @@ class LuaState:
         self.stack.extend(args)
         self.call(func_idx, nargs, 1)
         res = self.stack[func_idx]
-        while len(self.stack) > func_idx:
-            self.stack.pop()
+        del self.stack[func_idx:]
         return res
 
     def get_rk(self, rk: int) -> Value: